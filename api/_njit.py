@@ -0,0 +1,21 @@
+"""
+⚡ Numba JIT 헬퍼
+=================
+numba가 설치되어 있으면 njit으로 컴파일하고, 없으면 순수 파이썬 함수로 그대로 동작
+"""
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        """numba 미설치 시 아무것도 하지 않는 데코레이터 (@njit / @njit(...) 모두 지원)"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+
+        return decorator
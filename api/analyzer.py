@@ -4,15 +4,34 @@
 네이버금융 크롤러 + 기술적/펀더멘탈 분석기
 """
 
+import asyncio
+import contextlib
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import httpx
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer
+from lxml import etree
+import orjson
 import numpy as np
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from typing import List, Dict, Tuple, Optional
 from datetime import datetime
 import re
+import threading
 import time
 
+from cachetools import TTLCache
+
+from _njit import njit, HAS_NUMBA
+
+log = logging.getLogger(__name__)
+
 # ============================================================
 # 설정
 # ============================================================
@@ -42,14 +61,103 @@ SIGNAL_WEIGHTS = {
 }
 
 HEADERS = {
-    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/json;q=0.9",
+    "Accept-Encoding": "gzip, br",
 }
 
+# 페이지별 파싱 대상 (필요한 영역만 트리로 만든다)
+_MAIN_CLASSES = {"wrap_company", "no_today", "first", "gray"}
+_MAIN_IDS = {"_market_sum", "_quant"}
+
+
+def _main_page_filter(name: str, attrs: Dict) -> bool:
+    """메인 페이지: 종목명/현재가/시가총액/외국인 영역 + 모든 테이블"""
+    if name == "table":
+        return True
+    if attrs.get("id") in _MAIN_IDS:
+        return True
+    classes = attrs.get("class") or ""
+    if isinstance(classes, str):
+        classes = classes.split()
+    return any(c in _MAIN_CLASSES for c in classes)
+
+
+MAIN_STRAINER = SoupStrainer(_main_page_filter)
+SISE_STRAINER = SoupStrainer("table")
+
+# 네이버 요청 속도 제한 (초당 요청 수 / 한 번에 몰아서 허용할 요청 수)
+NAVER_RATE_LIMIT = float(os.getenv("NAVER_RATE_LIMIT", "10"))
+NAVER_RATE_BURST = int(os.getenv("NAVER_RATE_BURST", "10"))
+# 네이버 동시 연결 수 상한 (스레드풀 크기와 별개로 외부 요청 폭을 제한)
+NAVER_CONCURRENCY = int(os.getenv("NAVER_CONCURRENCY", "32"))
+
+# 동시에 진행할 종목 분석(크롤링) 수 상한 (요청과 무관하게 분석기가 소유, 진행 중 분석 공유 작업이 사용)
+ANALYSIS_CONCURRENCY = int(os.getenv("ANALYSIS_CONCURRENCY", "16"))
+
+# 파싱용 프로세스 풀 크기 (uvicorn 워커마다 생기므로 워커 수 × 이 값만큼 프로세스가 늘어남)
+PARSE_POOL_SIZE = int(os.getenv("PARSE_POOL_SIZE", "2"))
+
+# 지표 계산/신호/점수 산출을 프로세스 풀에서 실행할지 (일괄 분석 시 GIL 경합 분산, 기본 끔)
+ANALYSIS_IN_PROCESS_POOL = os.getenv("ANALYSIS_IN_PROCESS_POOL", "0") == "1"
+# 점수 산출용 프로세스 풀 크기 (파싱 풀과 따로 두어 파싱 뒤에 줄 서지 않도록, 기본 CPU 수)
+ANALYSIS_POOL_SIZE = int(os.getenv("ANALYSIS_POOL_SIZE", str(os.cpu_count() or 2)))
+
+# 결과 캐시 (같은 종목 반복 분석/검색 시 크롤링 생략)
+ANALYSIS_CACHE_TTL = 60          # 분석 결과: 1분
+STOCK_INFO_CACHE_TTL = 60        # 종목 기본 정보 (현재가 포함): 1분
+MISS_CACHE_TTL = 60              # 찾을 수 없는 종목: 1분 (조회가 성공했는데 결과가 없을 때만, 요청 실패는 캐시 안 함)
+SEARCH_CACHE_TTL = 60 * 60 * 24  # 종목명 → 종목코드: 1일
+
+_analysis_cache = TTLCache(maxsize=2048, ttl=ANALYSIS_CACHE_TTL)
+_stock_info_cache = TTLCache(maxsize=2048, ttl=STOCK_INFO_CACHE_TTL)
+_search_cache = TTLCache(maxsize=4096, ttl=SEARCH_CACHE_TTL)
+_miss_cache = TTLCache(maxsize=4096, ttl=MISS_CACHE_TTL)
+_cache_lock = threading.Lock()  # TTLCache는 스레드 안전하지 않음 (search_stock은 스레드풀에서 실행)
+
+
+def _cache_key(query: str) -> str:
+    """캐시 키 정규화 (" 005930", "samsung" 등 같은 종목이 다른 키로 캐시되지 않도록)"""
+    return query.strip().upper()
+
+# 진행 중인 크롤링 (같은 종목 동시 요청 시 한 번만 크롤링하고 결과 공유)
+_inflight_analysis: Dict[str, asyncio.Future] = {}
+_inflight_search: Dict[str, asyncio.Future] = {}
+
+
+async def _single_flight(inflight: Dict[str, asyncio.Future], key: str, make_coro):
+    """같은 키의 작업이 이미 진행 중이면 새로 시작하지 않고 그 결과를 함께 기다림"""
+    task = inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(make_coro())
+        inflight[key] = task
+        task.add_done_callback(lambda _: inflight.pop(key, None))
+    # 먼저 요청한 쪽이 취소돼도 같이 기다리는 쪽에는 영향 없도록 shield
+    return await asyncio.shield(task)
+
+# 모바일 API만으로 모두 채워지면 HTML 페이지 크롤링을 생략하는 항목
+REQUIRED_STOCK_FIELDS = (
+    "name", "current_price", "prev_close", "volume", "market_cap",
+    "high_52w", "low_52w", "per", "pbr", "roe", "foreign_ratio",
+)
+
+# 자주 쓰는 정규식 (호출마다 캐시 조회하지 않도록 미리 컴파일)
+_NUM_RE = re.compile(r'-?\d+(?:\.\d+)?')
+_DIGITS_RE = re.compile(r'([\d,]+)')
+_CODE_RE = re.compile(r'code=(\d{6})')
+_MCAP_RE = re.compile(r'시가총액[^\d]*([\d,]+)\s*(조|억)')
+_JO_RE = re.compile(r'([\d,]+)\s*조')
+_EOK_RE = re.compile(r'([\d,]+)\s*억')
+_PCT_RE = re.compile(r'([\d.]+)\s*%')
+_FOREIGN_PCT_RE = re.compile(r'외국인[^\d]*([\d.]+)\s*%')
+
 # ============================================================
 # 데이터 클래스
 # ============================================================
 
-@dataclass
+# slots=True: 인스턴스마다 __dict__를 만들지 않음 (분석마다 수십 개 생성)
+
+@dataclass(slots=True)
 class Signal:
     """분석 신호"""
     indicator: str
@@ -58,8 +166,11 @@ class Signal:
     
     def get_emoji(self) -> str:
         return {"bullish": "🟢", "bearish": "🔴", "neutral": "🟡"}[self.sentiment]
+    
+    def to_dict(self) -> Dict[str, str]:
+        return {"indicator": self.indicator, "value": self.value, "sentiment": self.sentiment}
 
-@dataclass
+@dataclass(slots=True)
 class StockData:
     """주식 데이터"""
     name: str = ""
@@ -95,7 +206,7 @@ class StockData:
     foreign_net: int = 0
     inst_net: int = 0
 
-@dataclass  
+@dataclass(slots=True)
 class TechnicalData:
     """기술적 지표"""
     ma5: float = 0
@@ -114,242 +225,418 @@ class TechnicalData:
     
     volume_ma20: float = 0
     
-    prices: List[float] = field(default_factory=list)
-    volumes: List[int] = field(default_factory=list)
+    prices: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.float64))
+    volumes: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int64))
+
+# ============================================================
+# HTML 파서 (CPU 작업 - 프로세스 풀에서 실행)
+# ============================================================
+
+_parse_pool: Optional[ProcessPoolExecutor] = None
+_analysis_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _spawn_pool(max_workers: int) -> ProcessPoolExecutor:
+    """
+    uvicorn 워커는 이미 여러 스레드가 도는 상태이므로 fork 대신 spawn으로 자식 프로세스를 만들어
+    다른 스레드가 잡고 있던 락을 물려받지 않도록 함
+    """
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+def _get_parse_pool() -> ProcessPoolExecutor:
+    """HTML 파싱용 프로세스 풀 (첫 사용 시 생성, 이벤트 루프/GIL을 막지 않도록)"""
+    global _parse_pool
+    with _pool_lock:
+        if _parse_pool is None:
+            _parse_pool = _spawn_pool(PARSE_POOL_SIZE)
+        return _parse_pool
+
+
+def _get_analysis_pool() -> ProcessPoolExecutor:
+    """점수 산출용 프로세스 풀 (ANALYSIS_IN_PROCESS_POOL일 때, 첫 사용 시 생성)"""
+    global _analysis_pool
+    with _pool_lock:
+        if _analysis_pool is None:
+            _analysis_pool = _spawn_pool(ANALYSIS_POOL_SIZE)
+        return _analysis_pool
+
+
+def _parse_number(text: str) -> float:
+    """문자열에서 숫자 추출"""
+    if not text:
+        return 0
+    match = _NUM_RE.search(text.replace(',', ''))
+    return float(match.group()) if match else 0
+
+
+def _filled_values(stock: StockData) -> Dict:
+    """값이 채워진 항목만 dict로 (프로세스 간 전달용)"""
+    return {f.name: getattr(stock, f.name) for f in fields(StockData) if getattr(stock, f.name)}
+
+
+def _parse_main_page(content: bytes) -> Dict:
+    """메인 페이지 파싱 → 채워진 항목만 dict로 반환"""
+    stock = StockData()
+    soup = BeautifulSoup(content, 'lxml', parse_only=MAIN_STRAINER)
+    tables = soup.find_all('table')
+    trs = soup.find_all('tr')
+    all_tds = soup.find_all('td')
+
+    # 종목명
+    wrap_company = soup.find('div', class_='wrap_company')
+    name_h2 = wrap_company.find('h2') if wrap_company else None
+    name_tag = name_h2.find('a') if name_h2 else None
+    if name_tag:
+        stock.name = name_tag.text.strip()
+
+    # 현재가
+    no_today = soup.find('p', class_='no_today')
+    price_tag = no_today.find('span', class_='blind') if no_today else None
+    if price_tag:
+        stock.current_price = _parse_number(price_tag.text)
+
+    # 전일종가
+    no_info = soup.find('table', class_='no_info')
+    for tr in (no_info.find_all('tr') if no_info else []):
+        th = tr.find('th')
+        td = tr.find('td')
+        if th and td:
+            label = th.get_text(strip=True)
+            if '전일' in label:
+                stock.prev_close = _parse_number(td.get_text())
+            elif '거래량' in label:
+                stock.volume = int(_parse_number(td.get_text()))
+
+    # 시가총액 - 새로운 방식
+    market_cap_area = soup.find('div', class_='first')
+    if market_cap_area:
+        text = market_cap_area.get_text()
+        if '시가총액' in text:
+            # 시가총액 순위 앞의 숫자 찾기
+            match = _MCAP_RE.search(text)
+            if match:
+                val = _parse_number(match.group(1))
+                unit = match.group(2)
+                if unit == '조':
+                    stock.market_cap = val * 1000000000000
+                else:
+                    stock.market_cap = val * 100000000
+
+    # 시가총액 대체 방식
+    if stock.market_cap == 0:
+        market_sum = soup.find('em', id='_market_sum')
+        if market_sum:
+            val = _parse_number(market_sum.get_text())
+            # 억 단위로 표시됨
+            stock.market_cap = val * 100000000
+
+    # 52주 최고/최저 - 개선된 방식
+    for row in trs:
+        text = row.get_text()
+        if '52주' in text:
+            for td in row.find_all('td', recursive=False):
+                # "52주최고|558,000" 또는 "52주최저|312,500" 패턴
+                spans = td.find_all('span', class_='blind')
+                if not spans:
+                    continue
+                if '최고' in text:
+                    stock.high_52w = _parse_number(spans[0].get_text())
+                if '최저' in text:
+                    val = _parse_number(spans[-1].get_text())
+                    if val > 0:
+                        stock.low_52w = val
+
+    # PER, EPS, PBR, BPS - 개선
+    per_table = soup.find('table', class_='per_table')
+    if per_table:
+        tds = [em for td in per_table.find_all('td') for em in td.find_all('em')]
+        values = [_parse_number(em.get_text()) for em in tds]
+        if len(values) >= 4:
+            stock.per = values[0] if values[0] > 0 else 0
+            stock.eps = values[1] if len(values) > 1 else 0
+            # 추정 PER/EPS와 실적 PBR/BPS 구분
+            if len(values) >= 6:
+                stock.pbr = values[4] if values[4] > 0 else (values[2] if values[2] > 0 else 0)
+                stock.bps = values[5] if len(values) > 5 else (values[3] if len(values) > 3 else 0)
+            else:
+                stock.pbr = values[2] if len(values) > 2 and values[2] > 0 else 0
+                stock.bps = values[3] if len(values) > 3 else 0
+
+    # 외국인 지분율 - 개선
+    foreign_area = soup.find('div', class_='gray')
+    if foreign_area:
+        text = foreign_area.get_text()
+        match = _FOREIGN_PCT_RE.search(text)
+        if match:
+            stock.foreign_ratio = float(match.group(1))
+
+    # 52주 고저 / 외국인 지분율 대체 - td 한 번 순회로 모두 확인
+    if not (stock.high_52w and stock.low_52w and stock.foreign_ratio):
+        for td in all_tds:
+            td_text = td.get_text()
+            if stock.high_52w == 0 and '52주최고' in td_text:
+                match = _DIGITS_RE.search(td_text.replace('52주최고', ''))
+                if match:
+                    stock.high_52w = _parse_number(match.group(1))
+            if stock.low_52w == 0 and '52주최저' in td_text:
+                match = _DIGITS_RE.search(td_text.replace('52주최저', ''))
+                if match:
+                    stock.low_52w = _parse_number(match.group(1))
+            if stock.foreign_ratio == 0 and '외국인' in td_text and '%' in td_text:
+                match = _PCT_RE.search(td_text)
+                if match:
+                    val = float(match.group(1))
+                    if 0 < val < 100:
+                        stock.foreign_ratio = val
+            if stock.high_52w and stock.low_52w and stock.foreign_ratio:
+                break
+
+    # ROE 크롤링 (tb_type1 테이블에서 추출)
+    for table in tables:
+        rows = table.find_all('tr')
+        for row in rows:
+            th = row.find('th')
+            if th and 'ROE' in th.get_text():
+                tds = row.find_all('td')
+                # 가장 최근의 유효한 ROE 값 추출
+                for td in tds:
+                    val_text = td.get_text(strip=True)
+                    if val_text and val_text != '-' and val_text != 'N/A':
+                        try:
+                            roe_val = _parse_number(val_text)
+                            if roe_val > 0:
+                                stock.roe = roe_val
+                                break
+                        except:
+                            continue
+                break
+        if stock.roe > 0:
+            break
+
+    return _filled_values(stock)
+
+
+def _parse_sise_page(content: bytes) -> Dict:
+    """시세 페이지 파싱 → 채워진 항목만 dict로 반환"""
+    stock = StockData()
+    soup = BeautifulSoup(content, 'lxml', parse_only=SISE_STRAINER)
+    trs = soup.find_all('tr')
+
+    # 전일종가
+    for tr in trs:
+        th = tr.select_one('th, td.title')
+        if th and '전일' in th.get_text():
+            td = tr.select_one('td span.blind')
+            if td:
+                stock.prev_close = _parse_number(td.get_text())
+                break
+
+    # 거래량
+    vol_td = soup.find('td', id='_quant')
+    if vol_td:
+        stock.volume = int(_parse_number(vol_td.get_text()))
+
+    # 52주 고저 (첫 번째 행 기준)
+    for tr in trs:
+        text = tr.get_text()
+        if '52주' in text and '최고' in text:
+            spans = tr.find_all('span', class_='blind')
+            if len(spans) >= 2:
+                if stock.high_52w == 0:
+                    stock.high_52w = _parse_number(spans[0].get_text())
+                if stock.low_52w == 0:
+                    stock.low_52w = _parse_number(spans[1].get_text())
+
+    return _filled_values(stock)
 
 # ============================================================
 # 네이버금융 크롤러
 # ============================================================
 
+class TokenBucket:
+    """
+    토큰 버킷 속도 제한기
+
+    requests(스레드)와 httpx(이벤트 루프) 요청이 함께 쓰므로 threading.Lock으로 보호하고,
+    락 안에서는 토큰 예약과 대기 시간 계산만 한 뒤 락 밖에서 기다린다.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """토큰 하나를 예약하고 기다려야 할 시간(초) 반환"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+    def acquire(self):
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def aacquire(self):
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+def _build_session() -> requests.Session:
+    """커넥션 풀 + 재시도가 설정된 세션 (모든 크롤러 인스턴스가 공유)"""
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    # pool_block: 연결이 모두 사용 중이면 새로 열지 않고 반납될 때까지 대기
+    adapter = HTTPAdapter(
+        pool_connections=NAVER_CONCURRENCY,
+        pool_maxsize=NAVER_CONCURRENCY,
+        pool_block=True,
+        max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504]),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
 class NaverFinanceCrawler:
     """네이버금융 데이터 크롤러"""
     
     BASE_URL = "https://finance.naver.com"
     CHART_URL = "https://fchart.stock.naver.com/sise.nhn"
-    
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update(HEADERS)
+    MOBILE_API_URL = "https://m.stock.naver.com/api/stock"
+
+    # 인스턴스마다 새 세션을 만들지 않고 커넥션 풀을 공유
+    session = _build_session()
+    # 모든 네이버 요청이 같은 속도 제한을 공유
+    rate_limiter = TokenBucket(NAVER_RATE_LIMIT, NAVER_RATE_BURST)
+    # 비동기 요청도 프로세스 전체가 클라이언트 하나를 공유 (요청마다 TCP/TLS 연결을 새로 맺지 않도록)
+    _async_client: Optional[httpx.AsyncClient] = None
     
     def search_stock(self, query: str) -> Optional[str]:
-        """종목명으로 종목코드 검색"""
+        """
+        종목명으로 종목코드 검색
+
+        검색 결과가 없으면 None. 요청/파싱 실패는 "종목 없음"과 구분되도록 예외로 전달
+        (찾지 못한 종목으로 캐시되지 않도록)
+        """
+        query = query.strip()
         if query.isdigit() and len(query) == 6:
             return query
         
+        key = _cache_key(query)
+        with _cache_lock:
+            cached = _search_cache.get(key)
+        if cached:
+            return cached
+        
         url = f"{self.BASE_URL}/search/searchList.naver?query={query}"
         try:
+            self.rate_limiter.acquire()
             resp = self.session.get(url, timeout=10)
-            soup = BeautifulSoup(resp.text, 'html.parser')
-            
+            resp.raise_for_status()
+            soup = BeautifulSoup(resp.content, 'lxml')
             link = soup.select_one('a.tit')
-            if link and 'href' in link.attrs:
-                match = re.search(r'code=(\d{6})', link['href'])
-                if match:
-                    return match.group(1)
-        except Exception as e:
-            print(f"검색 오류: {e}")
+        except Exception:
+            log.exception("종목 검색 오류: %s", query)
+            raise
+        
+        if link and 'href' in link.attrs:
+            match = _CODE_RE.search(link['href'])
+            if match:
+                code = match.group(1)
+                with _cache_lock:
+                    _search_cache[key] = code
+                return code
         
         return None
     
-    def get_stock_info(self, code: str) -> StockData:
-        """주식 기본 정보 크롤링"""
-        stock = StockData(code=code)
-
-        # 1. 메인 페이지
-        url = f"{self.BASE_URL}/item/main.naver?code={code}"
-        try:
-            resp = self.session.get(url, timeout=10)
-            soup = BeautifulSoup(resp.text, 'html.parser')
-
-            # 종목명
-            name_tag = soup.select_one('div.wrap_company h2 a')
-            if name_tag:
-                stock.name = name_tag.text.strip()
-
-            # 현재가
-            price_tag = soup.select_one('p.no_today span.blind')
-            if price_tag:
-                stock.current_price = self._parse_number(price_tag.text)
-
-            # 전일종가
-            for tr in soup.select('table.no_info tr'):
-                th = tr.select_one('th')
-                td = tr.select_one('td')
-                if th and td:
-                    label = th.get_text(strip=True)
-                    if '전일' in label:
-                        stock.prev_close = self._parse_number(td.get_text())
-                    elif '거래량' in label:
-                        stock.volume = int(self._parse_number(td.get_text()))
-
-            # 시가총액 - 새로운 방식
-            market_cap_area = soup.select_one('div.first')
-            if market_cap_area:
-                text = market_cap_area.get_text()
-                if '시가총액' in text:
-                    # 시가총액 순위 앞의 숫자 찾기
-                    match = re.search(r'시가총액[^\d]*([\d,]+)\s*(조|억)', text)
-                    if match:
-                        val = self._parse_number(match.group(1))
-                        unit = match.group(2)
-                        if unit == '조':
-                            stock.market_cap = val * 1000000000000
-                        else:
-                            stock.market_cap = val * 100000000
-
-            # 시가총액 대체 방식
-            if stock.market_cap == 0:
-                for em in soup.select('em'):
-                    em_id = em.get('id', '')
-                    if em_id == '_market_sum':
-                        val = self._parse_number(em.get_text())
-                        # 억 단위로 표시됨
-                        stock.market_cap = val * 100000000
-                        break
-
-            # 52주 최고/최저 - 개선된 방식
-            for table in soup.select('table'):
-                rows = table.select('tr')
-                for row in rows:
-                    text = row.get_text()
-                    if '52주' in text:
-                        tds = row.select('td')
-                        for td in tds:
-                            td_text = td.get_text()
-                            # "52주최고|558,000" 또는 "52주최저|312,500" 패턴
-                            if '최고' in text:
-                                spans = td.select('span.blind')
-                                if spans:
-                                    stock.high_52w = self._parse_number(spans[0].get_text())
-                            if '최저' in text:
-                                spans = td.select('span.blind')
-                                if spans and len(spans) > 0:
-                                    val = self._parse_number(spans[-1].get_text())
-                                    if val > 0:
-                                        stock.low_52w = val
-
-            # 52주 고저 - 대체 방식 (sise_new 테이블)
-            if stock.high_52w == 0 or stock.low_52w == 0:
-                for td in soup.select('td'):
-                    td_text = td.get_text()
-                    if '52주최고' in td_text:
-                        match = re.search(r'([\d,]+)', td_text.replace('52주최고', ''))
-                        if match:
-                            stock.high_52w = self._parse_number(match.group(1))
-                    if '52주최저' in td_text:
-                        match = re.search(r'([\d,]+)', td_text.replace('52주최저', ''))
-                        if match:
-                            stock.low_52w = self._parse_number(match.group(1))
-
-            # PER, EPS, PBR, BPS - 개선
-            per_table = soup.select_one('table.per_table')
-            if per_table:
-                tds = per_table.select('td em')
-                values = [self._parse_number(em.get_text()) for em in tds]
-                if len(values) >= 4:
-                    stock.per = values[0] if values[0] > 0 else 0
-                    stock.eps = values[1] if len(values) > 1 else 0
-                    # 추정 PER/EPS와 실적 PBR/BPS 구분
-                    if len(values) >= 6:
-                        stock.pbr = values[4] if values[4] > 0 else (values[2] if values[2] > 0 else 0)
-                        stock.bps = values[5] if len(values) > 5 else (values[3] if len(values) > 3 else 0)
-                    else:
-                        stock.pbr = values[2] if len(values) > 2 and values[2] > 0 else 0
-                        stock.bps = values[3] if len(values) > 3 else 0
-
-            # 외국인 지분율 - 개선
-            foreign_area = soup.select_one('div.gray')
-            if foreign_area:
-                text = foreign_area.get_text()
-                match = re.search(r'외국인[^\d]*([\d.]+)\s*%', text)
-                if match:
-                    stock.foreign_ratio = float(match.group(1))
-
-            # 외국인 지분율 대체
-            if stock.foreign_ratio == 0:
-                for td in soup.select('td'):
-                    td_text = td.get_text()
-                    if '외국인' in td_text and '%' in td_text:
-                        match = re.search(r'([\d.]+)\s*%', td_text)
-                        if match:
-                            val = float(match.group(1))
-                            if 0 < val < 100:
-                                stock.foreign_ratio = val
-                                break
+    async def asearch_stock(self, query: str) -> Optional[str]:
+        """search_stock의 비동기 버전 (같은 검색어 동시 요청은 한 번만 검색)"""
+        return await _single_flight(
+            _inflight_search, _cache_key(query),
+            lambda: asyncio.to_thread(self.search_stock, query),
+        )
+
+    async def aget_stock_info(self, code: str, client: Optional[httpx.AsyncClient] = None) -> StockData:
+        """주식 기본 정보 크롤링 - 모바일 JSON API 우선, 부족한 항목만 HTML 페이지로 보완"""
+        with _cache_lock:
+            cached = _stock_info_cache.get(code)
+        if cached is not None:
+            return cached
+
+        stock = await self._collect_stock_info(client or self.async_client(), code)
+
+        if stock.name or stock.current_price:
+            with _cache_lock:
+                _stock_info_cache[code] = stock
+        return stock
 
-            # ROE 크롤링 (tb_type1 테이블에서 추출)
-            for table in soup.find_all('table'):
-                rows = table.find_all('tr')
-                for row in rows:
-                    th = row.find('th')
-                    if th and 'ROE' in th.get_text():
-                        tds = row.find_all('td')
-                        # 가장 최근의 유효한 ROE 값 추출
-                        for td in tds:
-                            val_text = td.get_text(strip=True)
-                            if val_text and val_text != '-' and val_text != 'N/A':
-                                try:
-                                    roe_val = self._parse_number(val_text)
-                                    if roe_val > 0:
-                                        stock.roe = roe_val
-                                        break
-                                except:
-                                    continue
-                        break
-                if stock.roe > 0:
-                    break
+    async def _collect_stock_info(self, client: httpx.AsyncClient, code: str) -> StockData:
+        stock = StockData(code=code)
 
-        except Exception as e:
-            print(f"기본 정보 크롤링 오류: {e}")
+        # 1. 네이버 금융 모바일 API (기본/통합 투자지표/재무정보)
+        basic_resp, integration_resp, finance_resp = await self._fetch_all(client, [
+            f"{self.MOBILE_API_URL}/{code}/basic",
+            f"{self.MOBILE_API_URL}/{code}/integration",
+            f"{self.MOBILE_API_URL}/{code}/finance/annual",
+        ])
 
-        # 2. 시세 페이지 (추가 데이터)
-        url = f"{self.BASE_URL}/item/sise.naver?code={code}"
+        basic_error = basic_resp if isinstance(basic_resp, Exception) else self._unavailable_error(basic_resp)
         try:
-            resp = self.session.get(url, timeout=10)
-            soup = BeautifulSoup(resp.text, 'html.parser')
-
-            # 전일종가 재확인
-            if stock.prev_close == 0:
-                for tr in soup.select('tr'):
-                    th = tr.select_one('th, td.title')
-                    if th and '전일' in th.get_text():
-                        td = tr.select_one('td span.blind')
-                        if td:
-                            stock.prev_close = self._parse_number(td.get_text())
-                            break
-
-            # 거래량 재확인
-            if stock.volume == 0:
-                vol_td = soup.select_one('td#_quant')
-                if vol_td:
-                    stock.volume = int(self._parse_number(vol_td.get_text()))
-
-            # 52주 고저 재확인
-            for tr in soup.select('tr'):
-                text = tr.get_text()
-                if '52주' in text and '최고' in text:
-                    spans = tr.select('span.blind')
-                    if len(spans) >= 2:
-                        if stock.high_52w == 0:
-                            stock.high_52w = self._parse_number(spans[0].get_text())
-                        if stock.low_52w == 0:
-                            stock.low_52w = self._parse_number(spans[1].get_text())
-
+            if basic_error is None and basic_resp.status_code == 200:
+                self._apply_basic(stock, orjson.loads(basic_resp.content))
         except Exception as e:
-            pass
+            log.warning("기본 정보 API 파싱 오류: %s", code, exc_info=True)
+            basic_error = e
 
-        # 3. 종목분석 페이지 (ROE, 추가 재무정보)
-        url = f"{self.BASE_URL}/item/coinfo.naver?code={code}"
         try:
-            resp = self.session.get(url, timeout=10)
-            soup = BeautifulSoup(resp.text, 'html.parser')
+            if not isinstance(integration_resp, Exception) and integration_resp.status_code == 200:
+                self._apply_integration(stock, orjson.loads(integration_resp.content))
+        except Exception:
+            log.warning("투자지표 API 파싱 오류: %s", code, exc_info=True)
 
-            # iframe 내 데이터는 직접 접근 불가, 대신 투자지표 탭 사용
-        except Exception as e:
-            pass
+        # 재무정보 API (ROE 보완)
+        if stock.roe == 0:
+            try:
+                if not isinstance(finance_resp, Exception) and finance_resp.status_code == 200:
+                    self._apply_finance(stock, orjson.loads(finance_resp.content))
+            except Exception:
+                log.warning("재무정보 API 파싱 오류: %s", code, exc_info=True)
+
+        # 2. API로 채우지 못한 항목이 있을 때만 메인/시세 페이지 크롤링
+        if not self._is_complete(stock):
+            main_resp, sise_resp = await self._fetch_all(client, [
+                f"{self.BASE_URL}/item/main.naver?code={code}",
+                f"{self.BASE_URL}/item/sise.naver?code={code}",
+            ])
+
+            # 파싱은 프로세스 풀에서 (이벤트 루프를 막지 않음)
+            main_values, sise_values = await asyncio.gather(
+                self._parse_in_pool(_parse_main_page, main_resp),
+                self._parse_in_pool(_parse_sise_page, sise_resp),
+                return_exceptions=True,
+            )
+
+            if isinstance(main_values, Exception):
+                log.warning("기본 정보 크롤링 오류 (%s): %s", code, main_values)
+            else:
+                self._fill_missing(stock, main_values)
 
-        # 4. 네이버 금융 모바일 API (추가 데이터)
-        self._fetch_additional_data(stock, code)
+            # 시세 페이지 (추가 데이터)
+            if not isinstance(sise_values, Exception):
+                self._fill_missing(stock, sise_values)
+
+        # 아무 값도 얻지 못했는데 기본 정보 API 요청/파싱이 실패했으면 "종목 없음"이 아니라 조회 실패
+        if not stock.name and not stock.current_price and basic_error is not None:
+            raise basic_error
 
         # 전일종가가 없으면 현재가로 대체
         if stock.prev_close == 0:
@@ -357,155 +644,271 @@ class NaverFinanceCrawler:
 
         return stock
 
-    def _fetch_additional_data(self, stock: StockData, code: str):
-        """추가 데이터 수집 (시가총액, 외국인, ROE 등) - 네이버 모바일 API 활용"""
+    def async_client(self) -> httpx.AsyncClient:
+        """네이버 요청용 공유 비동기 클라이언트 (처음 쓸 때 생성, 앱 종료 시 aclose()로 닫음)"""
+        cls = type(self)
+        if cls._async_client is None or cls._async_client.is_closed:
+            cls._async_client = self._new_async_client()
+        return cls._async_client
 
-        # 통합 투자지표 API (가장 완전한 데이터)
-        try:
-            url = f"https://m.stock.naver.com/api/stock/{code}/integration"
-            resp = self.session.get(url, timeout=10)
-            if resp.status_code == 200:
-                data = resp.json()
-
-                if 'totalInfos' in data:
-                    for info in data['totalInfos']:
-                        key = info.get('key', '')
-                        code_type = info.get('code', '')
-                        value = info.get('value', '')
-
-                        # 52주 최고
-                        if code_type == 'highPriceOf52Weeks' or key == '52주 최고':
-                            if stock.high_52w == 0:
-                                stock.high_52w = self._parse_number(value)
-
-                        # 52주 최저
-                        elif code_type == 'lowPriceOf52Weeks' or key == '52주 최저':
-                            if stock.low_52w == 0:
-                                stock.low_52w = self._parse_number(value)
-
-                        # 거래량
-                        elif code_type == 'accumulatedTradingVolume' or key == '거래량':
-                            if stock.volume == 0:
-                                stock.volume = int(self._parse_number(value))
-
-                        # 시가총액
-                        elif code_type == 'marketValue' or key == '시총':
-                            if stock.market_cap == 0:
-                                # "16조 1,100억" 형태 파싱
-                                jo_match = re.search(r'([\d,]+)\s*조', value)
-                                eok_match = re.search(r'([\d,]+)\s*억', value)
-                                total = 0
-                                if jo_match:
-                                    total += self._parse_number(jo_match.group(1)) * 1000000000000
-                                if eok_match:
-                                    total += self._parse_number(eok_match.group(1)) * 100000000
-                                if total > 0:
-                                    stock.market_cap = total
-
-                        # 외국인 지분율
-                        elif code_type == 'foreignRate' or '외인' in key:
-                            if stock.foreign_ratio == 0:
-                                stock.foreign_ratio = self._parse_number(value.replace('%', ''))
-
-                        # ROE
-                        elif code_type == 'roe' or key == 'ROE':
-                            if stock.roe == 0:
-                                stock.roe = self._parse_number(value.replace('%', ''))
-
-                        # PER (백업)
-                        elif code_type == 'per' or key == 'PER':
-                            if stock.per == 0:
-                                stock.per = self._parse_number(value.replace('배', ''))
-
-                        # PBR (백업)
-                        elif code_type == 'pbr' or key == 'PBR':
-                            if stock.pbr == 0:
-                                stock.pbr = self._parse_number(value.replace('배', ''))
+    @classmethod
+    async def aclose(cls):
+        """공유 비동기 클라이언트 종료"""
+        if cls._async_client is not None:
+            await cls._async_client.aclose()
+            cls._async_client = None
 
-        except Exception as e:
-            pass
+    @staticmethod
+    def _new_async_client() -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            http2=True,
+            timeout=10,
+            headers=HEADERS,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=NAVER_CONCURRENCY),
+        )
+
+    async def _fetch_all(self, client: httpx.AsyncClient, urls: List[str]) -> List:
+        """여러 URL을 동시에 요청 (실패한 요청은 예외 객체로 반환)"""
+        return await asyncio.gather(*(self._get(client, url) for url in urls), return_exceptions=True)
+
+    async def _get(self, client: httpx.AsyncClient, url: str) -> httpx.Response:
+        await self.rate_limiter.aacquire()
+        return await client.get(url)
 
-        # 재무정보 API (ROE 보완)
-        if stock.roe == 0:
-            try:
-                url = f"https://m.stock.naver.com/api/stock/{code}/finance/annual"
-                resp = self.session.get(url, timeout=10)
-                if resp.status_code == 200:
-                    data = resp.json()
-
-                    if 'financeInfos' in data:
-                        for info in data['financeInfos']:
-                            if info.get('key') == 'roe':
-                                values = info.get('values', [])
-                                if values:
-                                    for v in reversed(values):
-                                        if v and v != '-':
-                                            stock.roe = self._parse_number(str(v))
-                                            break
+    @staticmethod
+    def _unavailable_error(resp: httpx.Response) -> Optional[httpx.HTTPStatusError]:
+        """일시적 실패 응답(429, 5xx)이면 예외 객체, 아니면 None (404 등은 종목 없음으로 취급)"""
+        if resp.status_code == 429 or resp.status_code >= 500:
+            return httpx.HTTPStatusError(
+                f"네이버 응답 오류 {resp.status_code}", request=resp.request, response=resp
+            )
+        return None
+
+    @staticmethod
+    def _is_complete(stock: StockData) -> bool:
+        """분석에 쓰는 항목이 모두 채워졌는지"""
+        return all(getattr(stock, name) for name in REQUIRED_STOCK_FIELDS)
+
+    async def _parse_in_pool(self, parser, resp) -> Dict:
+        if isinstance(resp, Exception):
+            raise resp
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_parse_pool(), parser, resp.content)
+
+    @staticmethod
+    def _fill_missing(stock: StockData, values: Dict):
+        """stock에서 비어 있는 항목만 values 값으로 채움"""
+        for name, value in values.items():
+            if value and not getattr(stock, name):
+                setattr(stock, name, value)
+
+    def _apply_basic(self, stock: StockData, data: Dict):
+        """기본 정보 API 응답 반영 (종목명, 현재가)"""
+        if not stock.name and data.get('stockName'):
+            stock.name = data['stockName']
+        if stock.current_price == 0 and data.get('closePrice'):
+            stock.current_price = self._parse_number(str(data['closePrice']))
+
+    def _apply_integration(self, stock: StockData, data: Dict):
+        """통합 투자지표 API 응답 반영 (시가총액, 외국인, ROE 등)"""
+        if 'totalInfos' in data:
+            for info in data['totalInfos']:
+                key = info.get('key', '')
+                code_type = info.get('code', '')
+                value = info.get('value', '')
+
+                # 현재가
+                if code_type == 'closePrice':
+                    if stock.current_price == 0:
+                        stock.current_price = self._parse_number(value)
+
+                # 전일종가
+                elif code_type == 'lastClosePrice' or key == '전일':
+                    if stock.prev_close == 0:
+                        stock.prev_close = self._parse_number(value)
+
+                # 52주 최고
+                elif code_type == 'highPriceOf52Weeks' or key == '52주 최고':
+                    if stock.high_52w == 0:
+                        stock.high_52w = self._parse_number(value)
+
+                # 52주 최저
+                elif code_type == 'lowPriceOf52Weeks' or key == '52주 최저':
+                    if stock.low_52w == 0:
+                        stock.low_52w = self._parse_number(value)
+
+                # 거래량
+                elif code_type == 'accumulatedTradingVolume' or key == '거래량':
+                    if stock.volume == 0:
+                        stock.volume = int(self._parse_number(value))
+
+                # 시가총액
+                elif code_type == 'marketValue' or key == '시총':
+                    if stock.market_cap == 0:
+                        # "16조 1,100억" 형태 파싱
+                        jo_match = _JO_RE.search(value)
+                        eok_match = _EOK_RE.search(value)
+                        total = 0
+                        if jo_match:
+                            total += self._parse_number(jo_match.group(1)) * 1000000000000
+                        if eok_match:
+                            total += self._parse_number(eok_match.group(1)) * 100000000
+                        if total > 0:
+                            stock.market_cap = total
+
+                # 외국인 지분율
+                elif code_type == 'foreignRate' or '외인' in key:
+                    if stock.foreign_ratio == 0:
+                        stock.foreign_ratio = self._parse_number(value.replace('%', ''))
+
+                # ROE
+                elif code_type == 'roe' or key == 'ROE':
+                    if stock.roe == 0:
+                        stock.roe = self._parse_number(value.replace('%', ''))
+
+                # PER (백업)
+                elif code_type == 'per' or key == 'PER':
+                    if stock.per == 0:
+                        stock.per = self._parse_number(value.replace('배', ''))
+
+                # EPS
+                elif code_type == 'eps' or key == 'EPS':
+                    if stock.eps == 0:
+                        stock.eps = self._parse_number(value.replace('원', ''))
+
+                # PBR (백업)
+                elif code_type == 'pbr' or key == 'PBR':
+                    if stock.pbr == 0:
+                        stock.pbr = self._parse_number(value.replace('배', ''))
+
+    def _apply_finance(self, stock: StockData, data: Dict):
+        """재무정보 API 응답 반영 (ROE 보완)"""
+        if 'financeInfos' in data:
+            for info in data['financeInfos']:
+                if info.get('key') == 'roe':
+                    values = info.get('values', [])
+                    if values:
+                        for v in reversed(values):
+                            if v and v != '-':
+                                stock.roe = self._parse_number(str(v))
+                                break
 
-            except Exception as e:
-                pass
     
-    def get_price_data(self, code: str, count: int = 120) -> Tuple[List[float], List[int]]:
+    def get_price_data(self, code: str, count: int = 120) -> Tuple[np.ndarray, np.ndarray]:
         """가격/거래량 히스토리"""
-        prices = []
-        volumes = []
+        prices = np.empty(0, dtype=np.float64)
+        volumes = np.empty(0, dtype=np.int64)
         
         url = f"{self.CHART_URL}?symbol={code}&timeframe=day&count={count}&requestType=0"
         try:
+            self.rate_limiter.acquire()
             resp = self.session.get(url, timeout=10)
-            soup = BeautifulSoup(resp.text, 'xml')
+            root = etree.fromstring(resp.content)
             
-            items = soup.select('item')
+            # <item data="날짜|시가|고가|저가|종가|거래량"/>
+            # 뒤에서부터 채워 역순 배열을 복사 없이 연속 메모리로 만든다
+            items = root.findall('.//item')
+            size = len(items)
+            buf_prices = np.empty(size, dtype=np.float64)
+            buf_volumes = np.empty(size, dtype=np.int64)
+            n = 0
             for item in items:
-                data = item.get('data', '').split('|')
+                data = (item.get('data') or '').split('|')
                 if len(data) >= 5:
-                    close = float(data[4])
-                    vol = int(data[5]) if len(data) > 5 else 0
-                    prices.append(close)
-                    volumes.append(vol)
+                    n += 1
+                    buf_prices[size - n] = float(data[4])
+                    buf_volumes[size - n] = int(data[5]) if len(data) > 5 else 0
             
-            prices.reverse()
-            volumes.reverse()
+            prices = buf_prices[size - n:]
+            volumes = buf_volumes[size - n:]
             
-        except Exception as e:
-            print(f"가격 데이터 크롤링 오류: {e}")
+        except Exception:
+            log.exception("가격 데이터 크롤링 오류: %s", code)
         
         return prices, volumes
     
-    def _parse_number(self, text: str) -> float:
-        """문자열에서 숫자 추출"""
-        if not text:
-            return 0
-        cleaned = re.sub(r'[^\d.\-]', '', text.replace(',', ''))
-        try:
-            return float(cleaned) if cleaned else 0
-        except:
-            return 0
+    _parse_number = staticmethod(_parse_number)
 
 # ============================================================
 # 기술적 지표 계산기
 # ============================================================
 
+@njit(cache=True)
+def _macd_loop(prices: np.ndarray) -> Tuple[float, float]:
+    """EMA12/EMA26/시그널(MACD의 EMA9)을 한 번의 루프로 계산 → (MACD, 시그널)"""
+    a12 = 2.0 / 13.0
+    a26 = 2.0 / 27.0
+    a9 = 2.0 / 10.0
+
+    ema12 = prices[0]
+    ema26 = prices[0]
+    macd = 0.0
+    signal = 0.0
+    for i in range(1, len(prices)):
+        p = prices[i]
+        ema12 = a12 * p + (1.0 - a12) * ema12
+        ema26 = a26 * p + (1.0 - a26) * ema26
+        macd = ema12 - ema26
+        # EMA26이 26개 구간을 채운 시점의 MACD로 시그널 초기화
+        if i < 25:
+            continue
+        if i == 25:
+            signal = macd
+        else:
+            signal = a9 * macd + (1.0 - a9) * signal
+
+    return macd, signal
+
+@njit(cache=True)
+def _rsi_loop(prices: np.ndarray, period: int) -> float:
+    """최근 period개 변화량으로 RSI 계산 (diff/상승/하락 분리를 한 번의 루프로)"""
+    n = len(prices)
+    if n < period + 1:
+        return 50.0
+
+    gain = 0.0
+    loss = 0.0
+    for i in range(n - period, n):
+        # 분기 없는 max 형태라 LLVM이 벡터화할 수 있음
+        delta = prices[i] - prices[i - 1]
+        gain += max(delta, 0.0)
+        loss += max(-delta, 0.0)
+
+    if loss == 0:
+        return 100.0
+
+    # 평균 상승/하락폭의 비율 = 합계의 비율
+    rs = gain / loss
+    return 100.0 - (100.0 / (1.0 + rs))
+
 class TechnicalCalculator:
     """기술적 지표 계산"""
     
     @staticmethod
-    def calculate_all(prices: List[float], volumes: List[int], current_price: float) -> TechnicalData:
+    def calculate_all(prices: np.ndarray, volumes: np.ndarray, current_price: float) -> TechnicalData:
+        # get_price_data가 반환한 float64 배열이면 복사 없이 그대로 사용
+        prices_arr = np.asarray(prices, dtype=np.float64)
         tech = TechnicalData()
-        tech.prices = prices
-        tech.volumes = volumes
+        tech.prices = prices_arr
+        tech.volumes = np.asarray(volumes, dtype=np.int64)
         
-        if len(prices) < 20:
+        if len(prices_arr) < 20:
             return tech
         
-        prices_arr = np.array(prices)
+        n = len(prices_arr)
+        
+        # 누적합 (앞에 0을 붙여 구간합 = csum[n] - csum[n - w])
+        csum = np.zeros(n + 1)
+        np.cumsum(prices_arr, out=csum[1:])
+        csum2 = np.zeros(n + 1)
+        np.cumsum(prices_arr * prices_arr, out=csum2[1:])
         
         # 이동평균선
-        tech.ma5 = float(np.mean(prices_arr[-5:])) if len(prices) >= 5 else current_price
-        tech.ma20 = float(np.mean(prices_arr[-20:])) if len(prices) >= 20 else current_price
-        tech.ma60 = float(np.mean(prices_arr[-60:])) if len(prices) >= 60 else current_price
-        tech.ma120 = float(np.mean(prices_arr[-120:])) if len(prices) >= 120 else current_price
+        tech.ma5 = float((csum[n] - csum[n - 5]) / 5) if n >= 5 else current_price
+        tech.ma20 = float((csum[n] - csum[n - 20]) / 20) if n >= 20 else current_price
+        tech.ma60 = float((csum[n] - csum[n - 60]) / 60) if n >= 60 else current_price
+        tech.ma120 = float((csum[n] - csum[n - 120]) / 120) if n >= 120 else current_price
         
         # RSI
         tech.rsi_14 = TechnicalCalculator._calculate_rsi(prices_arr, 14)
@@ -518,27 +921,32 @@ class TechnicalCalculator:
         
         # 볼린저밴드
         tech.bb_middle = tech.ma20
-        std = float(np.std(prices_arr[-20:])) if len(prices) >= 20 else 0
+        if n >= 20:
+            mean_sq = (csum2[n] - csum2[n - 20]) / 20
+            std = float(np.sqrt(max(mean_sq - tech.ma20 ** 2, 0.0)))
+        else:
+            std = 0
         tech.bb_upper = tech.bb_middle + (std * 2)
         tech.bb_lower = tech.bb_middle - (std * 2)
         
         # 거래량 MA
-        if volumes and len(volumes) >= 20:
-            tech.volume_ma20 = float(np.mean(volumes[-20:]))
+        if len(volumes) >= 20:
+            tech.volume_ma20 = float(np.mean(tech.volumes[-20:]))
         
         return tech
     
     @staticmethod
     def _calculate_rsi(prices: np.ndarray, period: int = 14) -> float:
+        if HAS_NUMBA:
+            return float(_rsi_loop(prices, period))
+        
+        # numba가 없으면 파이썬 루프 대신 필요한 구간만 numpy로 계산
         if len(prices) < period + 1:
             return 50
         
-        deltas = np.diff(prices)
-        gains = np.where(deltas > 0, deltas, 0)
-        losses = np.where(deltas < 0, -deltas, 0)
-        
-        avg_gain = np.mean(gains[-period:])
-        avg_loss = np.mean(losses[-period:])
+        deltas = np.diff(prices[-(period + 1):])
+        avg_gain = np.maximum(deltas, 0).mean()
+        avg_loss = np.maximum(-deltas, 0).mean()
         
         if avg_loss == 0:
             return 100
@@ -551,27 +959,10 @@ class TechnicalCalculator:
         if len(prices) < 26:
             return 0, 0
         
-        ema12 = TechnicalCalculator._ema(prices, 12)
-        ema26 = TechnicalCalculator._ema(prices, 26)
-        macd_line = ema12 - ema26
-        
-        signal = macd_line * 0.8
+        macd_line, signal = _macd_loop(prices)
         
         return float(macd_line), float(signal)
     
-    @staticmethod
-    def _ema(prices: np.ndarray, period: int) -> float:
-        if len(prices) < period:
-            return float(prices[-1]) if len(prices) > 0 else 0
-        
-        multiplier = 2 / (period + 1)
-        ema = float(prices[-period])
-        
-        for price in prices[-period+1:]:
-            ema = (float(price) * multiplier) + (ema * (1 - multiplier))
-        
-        return ema
-    
     @staticmethod
     def _calculate_stochastic(prices: np.ndarray, period: int = 14) -> float:
         if len(prices) < period:
@@ -597,11 +988,22 @@ class StockAnalyzer:
     def __init__(self, weights: Dict[str, float] = None):
         self.weights = weights or DEFAULT_WEIGHTS.copy()
         self.crawler = NaverFinanceCrawler()
+        # 진행 중 분석 공유 작업은 요청 쪽 자원(세마포어/클라이언트)을 쓰지 않고 이 세마포어와 공유 클라이언트만 사용
+        self._analysis_sem = asyncio.Semaphore(ANALYSIS_CONCURRENCY)
 
     def set_weights(self, technical: float, fundamental: float):
+        self.weights = self._normalize_weights(technical, fundamental)
+
+    @staticmethod
+    def _normalize_weights(technical: float, fundamental: float) -> Dict[str, float]:
         total = technical + fundamental
-        self.weights["technical"] = technical / total
-        self.weights["fundamental"] = fundamental / total
+        return {"technical": technical / total, "fundamental": fundamental / total}
+
+    def _resolve_weights(self, tech_weight: Optional[float], fund_weight: Optional[float]) -> Dict[str, float]:
+        """요청별 가중치가 주어지면 그것을, 아니면 인스턴스 기본 가중치를 사용"""
+        if tech_weight is None or fund_weight is None:
+            return self.weights
+        return self._normalize_weights(tech_weight, fund_weight)
 
     def _classify_stock_type(self, stock: StockData) -> str:
         """
@@ -626,24 +1028,139 @@ class StockAnalyzer:
 
         return "balanced"
     
-    def analyze(self, code_or_name: str) -> Optional[Dict]:
-        """종목 분석"""
-        # 종목코드 확인
-        code = self.crawler.search_stock(code_or_name)
+    async def aanalyze(self, code_or_name: str, tech_weight: Optional[float] = None,
+                       fund_weight: Optional[float] = None) -> Optional[Dict]:
+        """
+        종목 분석 (크롤링/지표 계산 결과는 1분간 캐시, 가중치는 호출마다 적용)
+
+        가중치를 인자로 받으므로 인스턴스 하나를 여러 요청이 공유해도 안전하다.
+        같은 종목을 동시에 요청하면 크롤링은 한 번만 수행한다.
+        """
+        weights = self._resolve_weights(tech_weight, fund_weight)
+        # 캐시 히트/최근에 찾지 못한 종목은 바로 반환
+        key = _cache_key(code_or_name)
+        with _cache_lock:
+            base = _analysis_cache.get(key)
+            if base is None and key in _miss_cache:
+                return None
+        if base is not None:
+            return self._apply_weights(base, weights)
+
+        return await self._analyze_one(None, code_or_name, weights)
+
+    async def analyze_many(self, codes: List[str], concurrency: int = 8,
+                           tech_weight: Optional[float] = None,
+                           fund_weight: Optional[float] = None) -> List:
+        """
+        여러 종목 동시 분석 (HTTP 클라이언트 공유 + 세마포어로 동시 요청 수 제한)
+
+        Returns:
+            codes 순서대로 분석 결과 dict / 종목 없음 None / 실패 시 예외 객체
+        """
+        weights = self._resolve_weights(tech_weight, fund_weight)
+        sem = asyncio.Semaphore(concurrency)
+        return await asyncio.gather(
+            *(self._analyze_one(sem, code, weights) for code in codes),
+            return_exceptions=True,
+        )
+
+    async def analyze_iter(self, codes: List[str], concurrency: int = 8,
+                           tech_weight: Optional[float] = None,
+                           fund_weight: Optional[float] = None):
+        """analyze_many와 같지만 끝나는 순서대로 (입력 종목, 결과 또는 예외)를 하나씩 반환"""
+        weights = self._resolve_weights(tech_weight, fund_weight)
+        sem = asyncio.Semaphore(concurrency)
+
+        async def run(code: str):
+            try:
+                return code, await self._analyze_one(sem, code, weights)
+            except Exception as e:
+                return code, e
+
+        tasks = [asyncio.ensure_future(run(code)) for code in codes]
+        try:
+            for fut in asyncio.as_completed(tasks):
+                yield await fut
+        finally:
+            # 클라이언트 연결이 끊겨 중간에 닫히면 남은 작업 취소
+            for task in tasks:
+                task.cancel()
+
+    async def _analyze_one(self, sem: Optional[asyncio.Semaphore],
+                           code_or_name: str, weights: Dict[str, float]) -> Optional[Dict]:
+        """
+        한 종목 분석 (sem은 호출한 쪽의 동시 처리 수 제한, 공유 작업 안으로는 넘기지 않음)
+
+        같은 종목의 진행 중 분석은 여러 요청이 함께 기다리므로, 먼저 요청한 쪽이 취소돼도
+        공유 작업이 계속 돌 수 있도록 요청 범위 자원을 공유 작업에 넘기지 않는다.
+        """
+        key = _cache_key(code_or_name)
+        with _cache_lock:
+            base = _analysis_cache.get(key)
+            if base is None and key in _miss_cache:
+                return None
+        if base is None:
+            async with sem or contextlib.nullcontext():
+                base = await _single_flight(
+                    _inflight_analysis, key,
+                    lambda: self._aanalyze_cached(key, code_or_name),
+                )
+            if base is None:
+                return None
+
+        return self._apply_weights(base, weights)
+
+    async def _aanalyze_cached(self, key: str, code_or_name: str) -> Optional[Dict]:
+        async with self._analysis_sem:
+            base = await self._aanalyze_base(self.crawler.async_client(), code_or_name)
+        with _cache_lock:
+            if base is None:
+                _miss_cache[key] = True
+            else:
+                _analysis_cache[key] = base
+        return base
+
+    def _apply_weights(self, base: Dict, weights: Dict[str, float]) -> Dict:
+        """캐시된 기본 결과에 가중치를 적용해 종합 점수/추천 계산"""
+        total_score = (base["technical_score"] * weights["technical"] +
+                      base["fundamental_score"] * weights["fundamental"])
+        recommendation, _ = self._get_recommendation(total_score)
+
+        result = dict(base)
+        result["total_score"] = total_score
+        result["recommendation"] = recommendation
+        result["weights"] = dict(weights)
+        return result
+
+    async def _aanalyze_base(self, client: httpx.AsyncClient, code_or_name: str) -> Optional[Dict]:
+        """
+        가중치와 무관한 분석 결과 (크롤링 + 지표 + 신호 + 부문별 점수)
+
+        기본 정보와 가격 데이터는 동시에 수집
+        """
+        code = await self.crawler.asearch_stock(code_or_name)
         if not code:
             return None
 
-        # 기본 정보
-        stock = self.crawler.get_stock_info(code)
+        stock, (prices, volumes) = await asyncio.gather(
+            self.crawler.aget_stock_info(code, client),
+            asyncio.to_thread(self.crawler.get_price_data, code, 120),
+        )
         if not stock.name and not stock.current_price:
             return None
 
+        if ANALYSIS_IN_PROCESS_POOL:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                _get_analysis_pool(), _build_base_in_worker, code_or_name, code, stock, prices, volumes
+            )
+        return self._build_base(code_or_name, code, stock, prices, volumes)
+
+    def _build_base(self, code_or_name: str, code: str, stock: StockData,
+                    prices: np.ndarray, volumes: np.ndarray) -> Dict:
         # 주식 유형 분류
         stock_type = self._classify_stock_type(stock)
 
-        # 가격 데이터
-        prices, volumes = self.crawler.get_price_data(code, 120)
-
         # 기술적 지표
         tech = TechnicalCalculator.calculate_all(prices, volumes, stock.current_price)
 
@@ -654,10 +1171,6 @@ class StockAnalyzer:
         # 가중치 기반 점수 계산
         tech_score = self._calculate_score(tech_signals)
         fund_score = self._calculate_score(fund_signals)
-        total_score = (tech_score * self.weights["technical"] +
-                      fund_score * self.weights["fundamental"])
-
-        recommendation, _ = self._get_recommendation(total_score)
         
         return {
             "code": code,
@@ -668,17 +1181,8 @@ class StockAnalyzer:
             "change_pct": ((stock.current_price / stock.prev_close) - 1) * 100 if stock.prev_close else 0,
             "technical_score": tech_score,
             "fundamental_score": fund_score,
-            "total_score": total_score,
-            "recommendation": recommendation,
-            "weights": self.weights.copy(),
-            "technical_signals": [
-                {"indicator": s.indicator, "value": s.value, "sentiment": s.sentiment}
-                for s in tech_signals
-            ],
-            "fundamental_signals": [
-                {"indicator": s.indicator, "value": s.value, "sentiment": s.sentiment}
-                for s in fund_signals
-            ],
+            "technical_signals": [s.to_dict() for s in tech_signals],
+            "fundamental_signals": [s.to_dict() for s in fund_signals],
             "stock_data": {
                 "per": stock.per,
                 "pbr": stock.pbr,
@@ -885,16 +1389,18 @@ class StockAnalyzer:
         if not signals:
             return 50
 
-        score_map = {"bullish": 100, "neutral": 50, "bearish": 0}
-
         weighted_sum = 0.0
         weight_total = 0.0
 
+        # 신호 점수: bullish=100, neutral=50, bearish=0 (문자열 비교로 dict 조회 생략)
         for signal in signals:
-            score = score_map[signal.sentiment]
             weight = SIGNAL_WEIGHTS.get(signal.indicator, 1.0)  # 기본 가중치 1.0
-            weighted_sum += score * weight
             weight_total += weight
+            sentiment = signal.sentiment
+            if sentiment == "bullish":
+                weighted_sum += 100 * weight
+            elif sentiment == "neutral":
+                weighted_sum += 50 * weight
 
         if weight_total == 0:
             return 50
@@ -912,3 +1418,19 @@ class StockAnalyzer:
             return "매도", "🔴🔴"
         else:
             return "적극 매도", "🔴🔴🔴"
+
+
+# ============================================================
+# 프로세스 풀 작업
+# ============================================================
+
+_worker_analyzer: Optional[StockAnalyzer] = None
+
+
+def _build_base_in_worker(code_or_name: str, code: str, stock: StockData,
+                          prices: np.ndarray, volumes: np.ndarray) -> Dict:
+    """워커 프로세스에서 StockAnalyzer._build_base 실행 (분석기는 프로세스당 한 번만 생성)"""
+    global _worker_analyzer
+    if _worker_analyzer is None:
+        _worker_analyzer = StockAnalyzer()
+    return _worker_analyzer._build_base(code_or_name, code, stock, prices, volumes)
@@ -4,16 +4,25 @@
 Railway 배포용 FastAPI 백엔드
 """
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Dict, Optional
+import anyio
 import asyncio
+import hashlib
+import logging
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-import json
+import orjson
 
-from analyzer import StockAnalyzer, NaverFinanceCrawler
-from supabase_client import SupabaseService
+from analyzer import StockAnalyzer
+from supabase_client import SupabaseService, flush_writes
+import db_pool
 
 # ============================================================
 # FastAPI 앱 설정
@@ -22,28 +31,91 @@ from supabase_client import SupabaseService
 app = FastAPI(
     title="📊 주식 종합 분석 API",
     description="네이버금융 크롤링 + 기술적/펀더멘탈 분석",
-    version="2.0.0"
+    version="2.0.0",
+    default_response_class=ORJSONResponse
+)
+
+# CORS 설정 (Vercel 프론트엔드 + 로컬 개발 허용, 다른 도메인은 CORS_ORIGIN_REGEX로 지정)
+CORS_ORIGIN_REGEX = os.getenv(
+    "CORS_ORIGIN_REGEX",
+    r"^(https?://localhost(:\d+)?|https://[^.]+\.vercel\.app)$"
 )
 
-# CORS 설정 (Vercel 프론트엔드 허용)
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=[
-        "http://localhost:3000",
-        "https://*.vercel.app",
-        "*"  # 개발 중에는 전체 허용, 프로덕션에서는 특정 도메인만
-    ],
+    allow_origin_regex=CORS_ORIGIN_REGEX,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PUT", "DELETE"],
+    allow_headers=["content-type", "authorization"],
 )
 
+# 분석기/크롤러는 모듈 단위로 하나만 만들어 재사용 (HTTP 세션 keep-alive 유지)
+# 가중치는 요청마다 인자로 넘기므로 공유해도 안전
+_ANALYZER = StockAnalyzer()
+_CRAWLER = _ANALYZER.crawler
+
+# 일괄 분석 시 동시에 처리할 종목 수 (네이버 요청 폭주 방지)
+BATCH_CONCURRENCY = 5
+
+# 스레드풀 크기 (기본값으로는 동시 분석 요청이 몰릴 때 대기열이 생김)
+THREADPOOL_SIZE = int(os.getenv("THREADPOOL_SIZE", "128"))
+
+# 로그 레벨 (DEBUG/INFO/WARNING/ERROR)
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+
+# 로그 출력은 별도 스레드(QueueListener)가 담당 → 요청 처리 중에는 큐에 넣기만 함
+_log_listener: Optional[QueueListener] = None
+
+@app.on_event("startup")
+async def configure_logging():
+    global _log_listener
+    log_queue = queue.SimpleQueue()
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [%(name)s] %(message)s"))
+    _log_listener = QueueListener(log_queue, handler)
+    _log_listener.start()
+
+    root = logging.getLogger()
+    root.addHandler(QueueHandler(log_queue))
+    root.setLevel(LOG_LEVEL)
+    # httpx는 요청마다 INFO 로그를 남기므로 (네이버 크롤링 요청이 많음) 경고 이상만 출력
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+@app.on_event("startup")
+async def configure_threadpool():
+    # asyncio.to_thread가 쓰는 이벤트 루프 기본 실행기
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=THREADPOOL_SIZE)
+    )
+    # 동기 엔드포인트/BackgroundTasks가 쓰는 anyio 스레드 제한 (기본 40)
+    anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+
+@app.on_event("startup")
+async def connect_supabase():
+    # PostgREST 클라이언트는 supabase_client에서 처음 쓸 때 생성
+    await db_pool.init_pool()
+
+@app.on_event("shutdown")
+async def disconnect_supabase():
+    await flush_writes()
+    await db_pool.close_pool()
+
+@app.on_event("shutdown")
+async def close_naver_client():
+    await _CRAWLER.aclose()
+
+@app.on_event("shutdown")
+async def stop_log_listener():
+    if _log_listener is not None:
+        _log_listener.stop()
+
 # ============================================================
 # 요청/응답 모델
 # ============================================================
 
 class AnalyzeRequest(BaseModel):
     """단일 종목 분석 요청"""
+    model_config = ConfigDict(extra="ignore")
     stock: str = Field(..., description="종목코드 또는 종목명", example="005930")
     tech_weight: float = Field(40, ge=0, le=100, description="기술적 분석 가중치 (%)")
     fund_weight: float = Field(60, ge=0, le=100, description="펀더멘탈 분석 가중치 (%)")
@@ -51,6 +123,7 @@ class AnalyzeRequest(BaseModel):
 
 class BatchAnalyzeRequest(BaseModel):
     """일괄 분석 요청"""
+    model_config = ConfigDict(extra="ignore")
     stocks: List[str] = Field(..., description="종목 목록", example=["005930", "060250"])
     tech_weight: float = Field(40, ge=0, le=100)
     fund_weight: float = Field(60, ge=0, le=100)
@@ -59,6 +132,7 @@ class BatchAnalyzeRequest(BaseModel):
 
 class WatchlistAddRequest(BaseModel):
     """관심종목 추가 요청"""
+    model_config = ConfigDict(extra="ignore")
     stock_code: str = Field(..., description="종목코드")
     stock_name: str = Field(..., description="종목명")
     market: Optional[str] = Field(None, description="시장 (KOSPI/KOSDAQ)")
@@ -70,23 +144,32 @@ class WatchlistAddRequest(BaseModel):
 
 class WatchlistUpdateRequest(BaseModel):
     """관심종목 수정 요청"""
+    model_config = ConfigDict(extra="ignore")
     buy_price: Optional[int] = None
     buy_quantity: Optional[int] = None
     buy_date: Optional[str] = None
     memo: Optional[str] = None
 
+class WatchlistCheckRequest(BaseModel):
+    """관심종목 여부 일괄 확인 요청"""
+    model_config = ConfigDict(extra="ignore")
+    stock_codes: List[str] = Field(..., description="종목코드 목록", example=["005930", "000660"])
+
 class SearchRequest(BaseModel):
     """종목 검색 요청"""
+    model_config = ConfigDict(extra="ignore")
     query: str = Field(..., description="검색어", example="삼성")
 
 class Signal(BaseModel):
     """분석 신호"""
+    model_config = ConfigDict(extra="ignore")
     indicator: str
     value: str
     sentiment: str
 
 class StockInfo(BaseModel):
     """종목 기본 정보"""
+    model_config = ConfigDict(extra="ignore")
     per: float = 0
     pbr: float = 0
     eps: float = 0
@@ -97,8 +180,15 @@ class StockInfo(BaseModel):
     volume: int = 0
     foreign_ratio: float = 0
 
+class Weights(BaseModel):
+    """적용된 가중치 (합계 1)"""
+    model_config = ConfigDict(extra="ignore")
+    technical: float
+    fundamental: float
+
 class AnalyzeResponse(BaseModel):
     """분석 결과"""
+    model_config = ConfigDict(extra="ignore")
     success: bool
     code: str
     name: str
@@ -111,20 +201,120 @@ class AnalyzeResponse(BaseModel):
     total_score: float
     recommendation: str
     recommendation_emoji: str
-    weights: Dict[str, float]
+    weights: Weights
     technical_signals: List[Signal]
     fundamental_signals: List[Signal]
     stock_info: StockInfo
     error: Optional[str] = None
-    saved: Optional[bool] = None  # Supabase 저장 성공 여부
+    saved: Optional[bool] = None  # Supabase 저장 요청 접수 여부 (저장은 백그라운드에서 실행)
     save_error: Optional[str] = None  # Supabase 저장 실패 시 에러 메시지
 
+class BatchSummary(BaseModel):
+    """일괄 분석 요약"""
+    model_config = ConfigDict(extra="ignore")
+    total_analyzed: int
+    failed: int
+    buy_signals: int
+    sell_signals: int
+    neutral_signals: int
+    avg_score: float
+    errors: Optional[List[str]] = None
+
 class BatchAnalyzeResponse(BaseModel):
     """일괄 분석 결과"""
+    model_config = ConfigDict(extra="ignore")
     success: bool
     count: int
     results: List[AnalyzeResponse]
-    summary: Dict
+    summary: BatchSummary
+
+# ============================================================
+# 응답 변환
+# ============================================================
+
+REC_EMOJI = {
+    "적극 매수": "🟢🟢🟢",
+    "매수": "🟢🟢",
+    "중립": "🟡",
+    "매도": "🔴🔴",
+    "적극 매도": "🔴🔴🔴"
+}
+
+_STOCK_INFO_DEFAULTS = StockInfo().model_dump()
+
+def _result_dict(result: Dict) -> Dict:
+    """분석 결과 dict → AnalyzeResponse와 같은 모양의 dict (pydantic 모델을 거치지 않음)"""
+    return {
+        "success": True,
+        "code": result["code"],
+        "name": result["name"],
+        "date": result["date"],
+        "current_price": result["current_price"],
+        "prev_close": result.get("prev_close", 0),
+        "change_pct": result["change_pct"],
+        "technical_score": result["technical_score"],
+        "fundamental_score": result["fundamental_score"],
+        "total_score": result["total_score"],
+        "recommendation": result["recommendation"],
+        "recommendation_emoji": REC_EMOJI.get(result["recommendation"], "🟡"),
+        "weights": result["weights"],
+        "technical_signals": result["technical_signals"],
+        "fundamental_signals": result["fundamental_signals"],
+        "stock_info": {**_STOCK_INFO_DEFAULTS, **result.get("stock_data", {})},
+        "error": None,
+        "saved": None,
+        "save_error": None,
+    }
+
+def _build_response(result: Dict, **extra) -> AnalyzeResponse:
+    """분석 결과 dict → AnalyzeResponse (분석기 내부 출력이므로 신호/종목 정보는 검증 생략)"""
+    data = _result_dict(result)
+    data.update(extra)
+    data["technical_signals"] = [Signal.model_construct(**s) for s in data["technical_signals"]]
+    data["fundamental_signals"] = [Signal.model_construct(**s) for s in data["fundamental_signals"]]
+    data["stock_info"] = StockInfo.model_construct(**data["stock_info"])
+    return AnalyzeResponse(**data)
+
+def _normalize_stock(stock: str) -> str:
+    """종목 입력 정규화 (공백만 있는 입력은 크롤링 전에 바로 거절)"""
+    stock = stock.strip()
+    if not stock:
+        raise HTTPException(status_code=400, detail="종목코드 또는 종목명을 입력해주세요")
+    return stock
+
+def _normalize_batch(stocks: List[str]) -> List[str]:
+    """일괄 분석 입력 정규화 (빈 항목 제거) + 개수 검사"""
+    stocks = [s.strip() for s in stocks if s.strip()]
+    
+    if len(stocks) > 20:
+        raise HTTPException(status_code=400, detail="최대 20개 종목까지 분석 가능합니다")
+    
+    if len(stocks) == 0:
+        raise HTTPException(status_code=400, detail="최소 1개 이상의 종목을 입력해주세요")
+    
+    return stocks
+
+def _build_summary(results: List[Dict], errors: List[str]) -> Dict:
+    """일괄 분석 요약 통계 (결과를 한 번만 순회)"""
+    buy_count = sell_count = 0
+    score_sum = 0.0
+    for r in results:
+        score = r["total_score"]
+        score_sum += score
+        if score >= 60:
+            buy_count += 1
+        elif score < 40:
+            sell_count += 1
+    
+    return {
+        "total_analyzed": len(results),
+        "failed": len(errors),
+        "buy_signals": buy_count,
+        "sell_signals": sell_count,
+        "neutral_signals": len(results) - buy_count - sell_count,
+        "avg_score": score_sum / len(results) if results else 0,
+        "errors": errors if errors else None
+    }
 
 # ============================================================
 # API 엔드포인트
@@ -137,7 +327,7 @@ async def root():
         "status": "healthy",
         "service": "Stock Analyzer API",
         "version": "2.0.0",
-        "timestamp": datetime.now().isoformat()
+        "timestamp": datetime.now()  # ORJSONResponse가 ISO 8601로 직렬화
     }
 
 @app.get("/health")
@@ -155,144 +345,129 @@ async def analyze_stock(request: AnalyzeRequest):
     - **fund_weight**: 펀더멘탈 분석 가중치 (0-100%)
     """
     try:
-        analyzer = StockAnalyzer()
-        analyzer.set_weights(request.tech_weight, request.fund_weight)
-        
-        result = await asyncio.to_thread(analyzer.analyze, request.stock)
+        stock = _normalize_stock(request.stock)
+        result = await _ANALYZER.aanalyze(stock, request.tech_weight, request.fund_weight)
         
         if not result:
             raise HTTPException(status_code=404, detail=f"종목을 찾을 수 없습니다: {request.stock}")
         
-        # 응답 변환
-        rec_emoji = {
-            "적극 매수": "🟢🟢🟢",
-            "매수": "🟢🟢",
-            "중립": "🟡",
-            "매도": "🔴🔴",
-            "적극 매도": "🔴🔴🔴"
-        }
-
-        # Supabase에 저장 (요청 시)
+        # Supabase 저장은 쓰기 큐에 넣고 바로 응답 (요청 시, 큐에서 모아서 일괄 insert)
         save_success = None
         save_error = None
         if request.save_result:
-            save_success, _, save_error = SupabaseService.save_analysis_result(result)
-
-        return AnalyzeResponse(
-            success=True,
-            code=result["code"],
-            name=result["name"],
-            date=result["date"],
-            current_price=result["current_price"],
-            prev_close=result.get("prev_close", 0),
-            change_pct=result["change_pct"],
-            technical_score=result["technical_score"],
-            fundamental_score=result["fundamental_score"],
-            total_score=result["total_score"],
-            recommendation=result["recommendation"],
-            recommendation_emoji=rec_emoji.get(result["recommendation"], "🟡"),
-            weights=result["weights"],
-            technical_signals=[Signal(**s) for s in result["technical_signals"]],
-            fundamental_signals=[Signal(**s) for s in result["fundamental_signals"]],
-            stock_info=StockInfo(**result.get("stock_data", {})),
-            saved=save_success,
-            save_error=save_error
-        )
+            SupabaseService.queue_analysis_result(result)
+            save_success = True
+
+        return _build_response(result, saved=save_success, save_error=save_error)
 
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/api/analyze/batch", response_model=BatchAnalyzeResponse)
-async def analyze_batch(request: BatchAnalyzeRequest):
+@app.post("/api/analyze/batch", responses={200: {"model": BatchAnalyzeResponse}})
+async def analyze_batch(request: BatchAnalyzeRequest, background_tasks: BackgroundTasks):
     """
     여러 종목 일괄 분석
     
+    응답은 BatchAnalyzeResponse와 같은 모양이지만 종목별 pydantic 모델 생성/검증 없이
+    dict를 바로 orjson으로 직렬화한다.
+    
     - **stocks**: 종목코드/종목명 배열 (최대 20개)
     - **tech_weight**: 기술적 분석 가중치
     - **fund_weight**: 펀더멘탈 분석 가중치
+    - **save_result**: 성공한 결과를 한 번의 insert로 Supabase에 저장 (응답 후 백그라운드)
     """
-    if len(request.stocks) > 20:
-        raise HTTPException(status_code=400, detail="최대 20개 종목까지 분석 가능합니다")
-    
-    if len(request.stocks) == 0:
-        raise HTTPException(status_code=400, detail="최소 1개 이상의 종목을 입력해주세요")
+    stocks = _normalize_batch(request.stocks)
     
     try:
-        analyzer = StockAnalyzer()
-        analyzer.set_weights(request.tech_weight, request.fund_weight)
-        
         results = []
+        to_save = []
         errors = []
         
-        for stock in request.stocks:
+        # 전 종목 동시 분석 (세마포어로 동시 요청 수 제한)
+        raw_results = await _ANALYZER.analyze_many(
+            stocks,
+            concurrency=BATCH_CONCURRENCY,
+            tech_weight=request.tech_weight,
+            fund_weight=request.fund_weight,
+        )
+        
+        for stock, result in zip(stocks, raw_results):
             try:
-                result = await asyncio.to_thread(analyzer.analyze, stock)
+                if isinstance(result, Exception):
+                    raise result
                 if result:
-                    rec_emoji = {
-                        "적극 매수": "🟢🟢🟢",
-                        "매수": "🟢🟢",
-                        "중립": "🟡", 
-                        "매도": "🔴🔴",
-                        "적극 매도": "🔴🔴🔴"
-                    }
-                    
-                    results.append(AnalyzeResponse(
-                        success=True,
-                        code=result["code"],
-                        name=result["name"],
-                        date=result["date"],
-                        current_price=result["current_price"],
-                        prev_close=result.get("prev_close", 0),
-                        change_pct=result["change_pct"],
-                        technical_score=result["technical_score"],
-                        fundamental_score=result["fundamental_score"],
-                        total_score=result["total_score"],
-                        recommendation=result["recommendation"],
-                        recommendation_emoji=rec_emoji.get(result["recommendation"], "🟡"),
-                        weights=result["weights"],
-                        technical_signals=[Signal(**s) for s in result["technical_signals"]],
-                        fundamental_signals=[Signal(**s) for s in result["fundamental_signals"]],
-                        stock_info=StockInfo(**result.get("stock_data", {}))
-                    ))
+                    results.append(_result_dict(result))
+                    to_save.append(result)
                 else:
                     errors.append(stock)
             except Exception as e:
                 errors.append(f"{stock}: {str(e)}")
-            
-            # API 부하 방지
-            await asyncio.sleep(0.5)
         
         # 점수순 정렬
-        results.sort(key=lambda x: x.total_score, reverse=True)
+        results.sort(key=lambda x: x["total_score"], reverse=True)
         
-        # 요약 통계
-        buy_count = len([r for r in results if r.total_score >= 60])
-        sell_count = len([r for r in results if r.total_score < 40])
+        if request.save_result and to_save:
+            background_tasks.add_task(SupabaseService.save_analysis_results_bulk, to_save)
         
-        summary = {
-            "total_analyzed": len(results),
-            "failed": len(errors),
-            "buy_signals": buy_count,
-            "sell_signals": sell_count,
-            "neutral_signals": len(results) - buy_count - sell_count,
-            "avg_score": sum(r.total_score for r in results) / len(results) if results else 0,
-            "errors": errors if errors else None
-        }
-        
-        return BatchAnalyzeResponse(
-            success=True,
-            count=len(results),
-            results=results,
-            summary=summary
-        )
+        return ORJSONResponse({
+            "success": True,
+            "count": len(results),
+            "results": results,
+            "summary": _build_summary(results, errors)
+        })
         
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/analyze/batch/stream")
+async def analyze_batch_stream(request: BatchAnalyzeRequest):
+    """
+    여러 종목 일괄 분석 (NDJSON 스트리밍)
+    
+    분석이 끝나는 순서대로 한 줄씩 전송하고 마지막 줄에 요약을 보낸다.
+    
+    - `{"type": "result", "data": {...}}`: 종목별 분석 결과 (AnalyzeResponse)
+    - `{"type": "error", "stock": "...", "message": "..."}`: 종목별 실패
+    - `{"type": "summary", "data": {...}}`: 전체 요약 (마지막 줄)
+    """
+    stocks = _normalize_batch(request.stocks)
+    
+    async def generate():
+        results = []
+        to_save = []
+        errors = []
+        
+        async for stock, result in _ANALYZER.analyze_iter(
+            stocks,
+            concurrency=BATCH_CONCURRENCY,
+            tech_weight=request.tech_weight,
+            fund_weight=request.fund_weight,
+        ):
+            if isinstance(result, Exception):
+                errors.append(f"{stock}: {str(result)}")
+                line = {"type": "error", "stock": stock, "message": str(result)}
+            elif not result:
+                errors.append(stock)
+                line = {"type": "error", "stock": stock, "message": "종목을 찾을 수 없습니다"}
+            else:
+                response = _result_dict(result)
+                results.append(response)
+                to_save.append(result)
+                line = {"type": "result", "data": response}
+            yield orjson.dumps(line) + b"\n"
+        
+        yield orjson.dumps({"type": "summary", "data": _build_summary(results, errors)}) + b"\n"
+        
+        # 요약까지 보낸 뒤 한 번에 저장
+        if request.save_result and to_save:
+            await SupabaseService.save_analysis_results_bulk(to_save)
+    
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
 @app.get("/api/search")
 async def search_stock(query: str):
     """
@@ -301,14 +476,13 @@ async def search_stock(query: str):
     - **query**: 검색어 (종목명 또는 종목코드)
     """
     try:
-        crawler = NaverFinanceCrawler()
-        code = await asyncio.to_thread(crawler.search_stock, query)
+        code = await _CRAWLER.asearch_stock(query)
         
         if not code:
             return {"success": False, "results": [], "message": "검색 결과가 없습니다"}
         
         # 기본 정보 가져오기
-        stock = await asyncio.to_thread(crawler.get_stock_info, code)
+        stock = await _CRAWLER.aget_stock_info(code)
         
         return {
             "success": True,
@@ -344,7 +518,7 @@ async def get_presets():
 async def get_watchlist():
     """관심종목 목록 조회"""
     try:
-        watchlist = SupabaseService.get_watchlist()
+        watchlist = await SupabaseService.get_watchlist()
         return {
             "success": True,
             "count": len(watchlist),
@@ -358,7 +532,7 @@ async def get_watchlist():
 async def add_to_watchlist(request: WatchlistAddRequest):
     """관심종목 추가"""
     try:
-        success, result, error_msg = SupabaseService.add_to_watchlist(
+        success, result, error_msg = await SupabaseService.add_to_watchlist(
             stock_code=request.stock_code,
             stock_name=request.stock_name,
             market=request.market,
@@ -388,7 +562,7 @@ async def update_watchlist_item(stock_code: str, request: WatchlistUpdateRequest
         if not updates:
             raise HTTPException(status_code=400, detail="수정할 내용이 없습니다")
 
-        result = SupabaseService.update_watchlist_item(stock_code, updates)
+        result = await SupabaseService.update_watchlist_item(stock_code, updates)
 
         if result:
             return {"success": True, "message": "수정되었습니다", "data": result}
@@ -405,7 +579,7 @@ async def update_watchlist_item(stock_code: str, request: WatchlistUpdateRequest
 async def remove_from_watchlist(stock_code: str):
     """관심종목에서 제거"""
     try:
-        success = SupabaseService.remove_from_watchlist(stock_code)
+        success = await SupabaseService.remove_from_watchlist(stock_code)
 
         if success:
             return {"success": True, "message": "삭제되었습니다"}
@@ -419,24 +593,69 @@ async def remove_from_watchlist(stock_code: str):
 @app.get("/api/watchlist/{stock_code}/check")
 async def check_watchlist(stock_code: str):
     """관심종목 여부 확인"""
-    is_in = SupabaseService.is_in_watchlist(stock_code)
+    is_in = await SupabaseService.is_in_watchlist(stock_code)
     return {"success": True, "is_in_watchlist": is_in}
 
 
+@app.post("/api/watchlist/check")
+async def check_watchlist_many(request: WatchlistCheckRequest):
+    """여러 종목의 관심종목 여부를 한 번에 확인"""
+    result = await SupabaseService.are_in_watchlist(request.stock_codes)
+    return {"success": True, "data": result}
+
+
 # ============================================================
 # 분석 히스토리 API
 # ============================================================
 
+def _history_etag(latest: Optional[str], *parts) -> Optional[str]:
+    """최근 분석 시각 + 조회 조건으로 ETag 생성 (분석 기록이 없으면 None)"""
+    if not latest:
+        return None
+    key = "|".join(str(part) for part in (latest, *parts))
+    return '"' + hashlib.md5(key.encode()).hexdigest() + '"'
+
+
 @app.get("/api/history")
-async def get_analysis_history(stock_code: Optional[str] = None, limit: int = 50):
-    """분석 히스토리 조회"""
+async def get_analysis_history(request: Request, stock_code: Optional[str] = None, limit: int = 50):
+    """
+    분석 히스토리 조회
+    
+    최근 분석 시각으로 ETag를 만들어, 새 분석이 없으면 목록 조회 없이 304를 반환한다.
+    """
     try:
-        history = SupabaseService.get_analysis_history(stock_code=stock_code, limit=limit)
-        return {
+        latest = await SupabaseService.get_latest_analyzed_at(stock_code)
+        etag = _history_etag(latest, stock_code, limit)
+        if etag and request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        
+        history = await SupabaseService.get_analysis_history(stock_code=stock_code, limit=limit)
+        headers = {"ETag": etag, "Cache-Control": "private, max-age=5"} if etag else None
+        return ORJSONResponse({
             "success": True,
             "count": len(history),
             "data": history
-        }
+        }, headers=headers)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/api/history/latest")
+async def get_latest_analysis_per_stock(request: Request, limit: int = 50):
+    """종목별 가장 최근 분석 결과 (중복 제거는 DB 뷰에서 처리)"""
+    try:
+        latest = await SupabaseService.get_latest_analyzed_at()
+        etag = _history_etag(latest, "latest", limit)
+        if etag and request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        
+        items = await SupabaseService.get_latest_analysis_per_stock(limit=limit)
+        headers = {"ETag": etag, "Cache-Control": "private, max-age=5"} if etag else None
+        return ORJSONResponse({
+            "success": True,
+            "count": len(items),
+            "data": items
+        }, headers=headers)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -447,4 +666,14 @@ async def get_analysis_history(stock_code: Optional[str] = None, limit: int = 50
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+
+    # 멀티 워커 (캐시/분석기 싱글톤은 워커 프로세스마다 따로 유지됨)
+    workers = int(os.getenv("WEB_CONCURRENCY", min(8, os.cpu_count() or 1)))
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=int(os.getenv("PORT", 8000)),
+        workers=workers,
+        loop="uvloop",
+        http="httptools",
+    )
@@ -0,0 +1,236 @@
+"""
+분석기 비동기 경로 테스트
+=========================
+네트워크 없이 _aanalyze_base/요청 함수를 대체해 진행 중 분석 공유(single-flight)와
+찾지 못한 종목 캐시 동작 확인, 기술적 지표 커널을 기준 구현(pandas 방식)과 비교
+"""
+
+import asyncio
+import os
+import sys
+import unittest
+
+import httpx
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import analyzer
+from analyzer import StockAnalyzer, TechnicalCalculator
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+
+class SingleFlightCancelTest(unittest.IsolatedAsyncioTestCase):
+    """먼저 기다리던 요청이 취소돼도 같은 종목을 기다리는 다른 요청은 결과를 받아야 함"""
+
+    def setUp(self):
+        for cache in (analyzer._analysis_cache, analyzer._miss_cache):
+            cache.clear()
+        analyzer._inflight_analysis.clear()
+
+    async def asyncTearDown(self):
+        await analyzer.NaverFinanceCrawler.aclose()
+
+    async def test_first_waiter_cancelled_second_still_gets_result(self):
+        stock_analyzer = StockAnalyzer()
+        started = asyncio.Event()
+        release = asyncio.Event()
+        clients = []
+
+        async def fake_base(client, code_or_name):
+            clients.append(client)
+            started.set()
+            await release.wait()
+            # 공유 작업이 쓰는 클라이언트는 첫 요청이 취소돼도 닫히지 않아야 함
+            self.assertFalse(client.is_closed)
+            return {"code": "005930", "technical_score": 50.0, "fundamental_score": 70.0}
+
+        stock_analyzer._aanalyze_base = fake_base
+
+        first = asyncio.create_task(stock_analyzer.aanalyze("005930"))
+        await started.wait()
+        second = asyncio.create_task(
+            stock_analyzer.analyze_many(["005930"], concurrency=1)
+        )
+        await asyncio.sleep(0)
+
+        first.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await first
+
+        release.set()
+        [result] = await second
+
+        self.assertIsInstance(result, dict)
+        self.assertEqual(result["code"], "005930")
+        self.assertEqual(len(clients), 1)
+        self.assertIs(clients[0], stock_analyzer.crawler.async_client())
+
+
+def _response(status_code: int) -> httpx.Response:
+    return httpx.Response(status_code, request=httpx.Request("GET", "https://m.stock.naver.com"))
+
+
+class MissCacheTest(unittest.IsolatedAsyncioTestCase):
+    """조회가 성공했는데 결과가 없을 때만 찾지 못한 종목으로 캐시 (요청 실패는 캐시하지 않음)"""
+
+    def setUp(self):
+        for cache in (analyzer._analysis_cache, analyzer._miss_cache, analyzer._stock_info_cache):
+            cache.clear()
+        analyzer._inflight_analysis.clear()
+        self.stock_analyzer = StockAnalyzer()
+
+    async def asyncTearDown(self):
+        await analyzer.NaverFinanceCrawler.aclose()
+
+    async def test_search_without_result_is_cached_as_miss(self):
+        async def no_result(query):
+            return None
+
+        self.stock_analyzer.crawler.asearch_stock = no_result
+
+        self.assertIsNone(await self.stock_analyzer.aanalyze("없는종목"))
+        self.assertIn(analyzer._cache_key("없는종목"), analyzer._miss_cache)
+
+    async def test_search_failure_is_not_cached(self):
+        async def timeout(query):
+            raise httpx.ConnectTimeout("timed out")
+
+        self.stock_analyzer.crawler.asearch_stock = timeout
+
+        with self.assertRaises(httpx.ConnectTimeout):
+            await self.stock_analyzer.aanalyze("삼성전자")
+        self.assertNotIn(analyzer._cache_key("삼성전자"), analyzer._miss_cache)
+
+    async def test_stock_info_outage_raises_instead_of_empty_stock(self):
+        crawler = self.stock_analyzer.crawler
+        for failure in (httpx.ConnectError("down"), _response(503), _response(429)):
+            async def fetch_all(client, urls, failure=failure):
+                return [failure for _ in urls]
+
+            crawler._fetch_all = fetch_all
+            with self.assertRaises(httpx.HTTPError):
+                await crawler.aget_stock_info("005930")
+
+    async def test_unknown_code_returns_empty_stock(self):
+        async def fetch_all(client, urls):
+            return [_response(404) for _ in urls]
+
+        self.stock_analyzer.crawler._fetch_all = fetch_all
+        stock = await self.stock_analyzer.crawler.aget_stock_info("999999")
+        self.assertFalse(stock.name or stock.current_price)
+
+
+# ============================================================
+# 기술적 지표 (njit 커널 / 누적합 이동평균 vs 기준 구현)
+# ============================================================
+
+def _ema_series(values: np.ndarray, span: int) -> np.ndarray:
+    """pandas Series.ewm(span=span, adjust=False).mean()과 같은 EMA (첫 값으로 시작)"""
+    alpha = 2.0 / (span + 1)
+    out = np.empty(len(values))
+    out[0] = values[0]
+    for i in range(1, len(values)):
+        out[i] = alpha * values[i] + (1 - alpha) * out[i - 1]
+    return out
+
+
+def _reference_macd(prices: np.ndarray):
+    """MACD = EMA12 - EMA26, 시그널 = EMA26이 26개 구간을 채운 인덱스 25부터의 MACD EMA9"""
+    macd = _ema_series(prices, 12) - _ema_series(prices, 26)
+    return macd[-1], _ema_series(macd[25:], 9)[-1]
+
+
+def _reference_rsi(prices: np.ndarray, period: int = 14) -> float:
+    """최근 period개 변화량의 단순 평균 상승/하락폭으로 RSI (rolling(period).mean() 기준)"""
+    deltas = np.diff(prices)[-period:]
+    gain = np.where(deltas > 0, deltas, 0).mean()
+    loss = np.where(deltas < 0, -deltas, 0).mean()
+    return 100.0 if loss == 0 else 100 - 100 / (1 + gain / loss)
+
+
+def _price_series(n: int) -> np.ndarray:
+    """고정 시드 랜덤워크 가격 (실제 주가 수준의 값으로 누적합 오차 확인)"""
+    rng = np.random.default_rng(20240101)
+    return 70000 + np.cumsum(rng.normal(0, 800, n))
+
+
+class TechnicalKernelTest(unittest.TestCase):
+    """calculate_all이 기준 구현과 같은 값을 내는지 (워밍업 경계 포함)"""
+
+    def assertClose(self, actual, expected, rel=1e-9):
+        self.assertAlmostEqual(actual, expected, delta=max(abs(expected) * rel, 1e-9))
+
+    def test_moving_averages_and_bollinger(self):
+        for n in (20, 59, 60, 119, 120, 200):
+            prices = _price_series(n)
+            current = float(prices[-1])
+            tech = TechnicalCalculator.calculate_all(prices, np.ones(n, dtype=np.int64), current)
+            with self.subTest(n=n):
+                for window, value in ((5, tech.ma5), (20, tech.ma20), (60, tech.ma60), (120, tech.ma120)):
+                    expected = prices[-window:].mean() if n >= window else current
+                    self.assertClose(value, expected)
+                std = prices[-20:].std()  # 모집단 표준편차 (rolling(20).std(ddof=0))
+                self.assertClose(tech.bb_middle, prices[-20:].mean())
+                self.assertClose(tech.bb_upper, prices[-20:].mean() + 2 * std)
+                self.assertClose(tech.bb_lower, prices[-20:].mean() - 2 * std)
+
+    def test_flat_prices_have_zero_band_width(self):
+        prices = np.full(40, 55000.0)
+        tech = TechnicalCalculator.calculate_all(prices, np.ones(40, dtype=np.int64), 55000.0)
+        self.assertClose(tech.bb_upper, 55000.0)
+        self.assertClose(tech.bb_lower, 55000.0)
+
+    def test_macd_matches_reference(self):
+        for n in (26, 27, 35, 120):
+            prices = _price_series(n)
+            macd, signal = TechnicalCalculator._calculate_macd(prices)
+            expected_macd, expected_signal = _reference_macd(prices)
+            with self.subTest(n=n):
+                self.assertClose(macd, expected_macd)
+                self.assertClose(signal, expected_signal)
+
+    def test_macd_signal_seeded_at_index_25(self):
+        # 26개면 시그널은 인덱스 25의 MACD 그 자체, 25개 이하는 계산하지 않음
+        prices = _price_series(26)
+        macd, signal = analyzer._macd_loop(prices)
+        self.assertEqual(macd, signal)
+        self.assertEqual(TechnicalCalculator._calculate_macd(prices[:25]), (0, 0))
+
+    def test_rsi_matches_reference(self):
+        for n in (15, 16, 30, 120):
+            prices = _price_series(n)
+            with self.subTest(n=n):
+                self.assertClose(float(analyzer._rsi_loop(prices, 14)), _reference_rsi(prices))
+                self.assertClose(TechnicalCalculator._calculate_rsi(prices, 14), _reference_rsi(prices))
+
+    def test_rsi_window_edges(self):
+        # 변화량이 period개 미만이면 중립값, 하락이 없으면 100
+        self.assertEqual(float(analyzer._rsi_loop(_price_series(14), 14)), 50.0)
+        self.assertEqual(float(analyzer._rsi_loop(np.arange(1.0, 16.0), 14)), 100.0)
+        # 창 밖(가장 오래된) 변화량은 결과에 영향이 없어야 함
+        prices = _price_series(30)
+        shifted = prices.copy()
+        shifted[:15] += 5000
+        self.assertClose(float(analyzer._rsi_loop(prices, 14)), float(analyzer._rsi_loop(shifted, 14)))
+
+    @unittest.skipIf(pd is None, "pandas 미설치")
+    def test_reference_matches_pandas(self):
+        series = pd.Series(_price_series(120))
+        macd = series.ewm(span=12, adjust=False).mean() - series.ewm(span=26, adjust=False).mean()
+        expected_macd, expected_signal = _reference_macd(series.to_numpy())
+        self.assertClose(macd.iloc[-1], expected_macd)
+        self.assertClose(macd.iloc[25:].ewm(span=9, adjust=False).mean().iloc[-1], expected_signal)
+
+        deltas = series.diff()
+        gain = deltas.clip(lower=0).rolling(14).mean().iloc[-1]
+        loss = (-deltas).clip(lower=0).rolling(14).mean().iloc[-1]
+        self.assertClose(100 - 100 / (1 + gain / loss), _reference_rsi(series.to_numpy()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+"""
+API 엔드포인트 테스트
+=====================
+Supabase 요청을 대체해 네트워크 없이 엔드포인트 응답 확인
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from fastapi.testclient import TestClient
+
+    import main
+    import supabase_client
+except ImportError as e:
+    # supabase/postgrest/asyncpg가 없는 환경에서는 모듈 전체를 건너뜀 (pytest/unittest 모두 skip 처리)
+    raise unittest.SkipTest(f"API 의존성 미설치: {e}")
+
+from tests.test_supabase_client import RecordingClient
+
+
+class WatchlistCheckEndpointTest(unittest.TestCase):
+    """POST /api/watchlist/check"""
+
+    def setUp(self):
+        self.client = RecordingClient([{"stock_code": "005930"}])
+        self._original_client = supabase_client._client
+        self._original_cache = supabase_client._watchlist_cache
+        self._original_pool = supabase_client.db_pool.pool
+        supabase_client._client = lambda: self.client
+        supabase_client._watchlist_cache = supabase_client._MemoryCache(60)
+        supabase_client.db_pool.pool = None
+        # startup/shutdown 훅(로그/DB 풀)은 실행하지 않음
+        self.http = TestClient(main.app)
+
+    def tearDown(self):
+        supabase_client._client = self._original_client
+        supabase_client._watchlist_cache = self._original_cache
+        supabase_client.db_pool.pool = self._original_pool
+
+    def test_mixed_hits_and_misses(self):
+        response = self.http.post("/api/watchlist/check", json={"stock_codes": ["005930", "000660"]})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"success": True, "data": {"005930": True, "000660": False}})
+        self.assertEqual(self.client.query.executed, 1)
+
+    def test_empty_list(self):
+        response = self.http.post("/api/watchlist/check", json={"stock_codes": []})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"success": True, "data": {}})
+        self.assertEqual(self.client.query.executed, 0)
+
+    def test_missing_body_is_rejected(self):
+        self.assertEqual(self.http.post("/api/watchlist/check", json={}).status_code, 422)
+
+
+if __name__ == "__main__":
+    unittest.main()
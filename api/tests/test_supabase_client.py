@@ -0,0 +1,295 @@
+"""
+Supabase 서비스 테스트
+======================
+네트워크 없이 쿼리 실행/재시도, 서비스 메서드의 요청 생략, 요청 본문 직렬화,
+분석 결과 쓰기 큐 동작 확인
+"""
+
+import asyncio
+import os
+import sys
+import unittest
+from datetime import datetime
+
+import httpx
+import numpy as np
+import orjson
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import db_pool
+    import supabase_client
+except ImportError as e:
+    # supabase/postgrest/asyncpg가 없는 환경에서는 모듈 전체를 건너뜀 (pytest/unittest 모두 skip 처리)
+    raise unittest.SkipTest(f"Supabase 의존성 미설치: {e}")
+
+
+class FlakyQuery:
+    """첫 execute()에서만 지정한 예외를 던지는 쿼리"""
+
+    def __init__(self, error: type):
+        self.error = error
+        self.calls = 0
+
+    async def execute(self):
+        self.calls += 1
+        if self.calls == 1:
+            raise self.error("connection lost")
+        return "ok"
+
+
+class ExecuteRetryTest(unittest.IsolatedAsyncioTestCase):
+    """요청이 이미 처리됐을 수 있는 오류는 다시 보내도 안전한 쿼리만 재시도"""
+
+    async def test_connect_error_is_retried_for_any_query(self):
+        query = FlakyQuery(httpx.ConnectError)
+        self.assertEqual(await supabase_client._execute(query), "ok")
+        self.assertEqual(query.calls, 2)
+
+    async def test_read_error_is_retried_for_idempotent_query(self):
+        query = FlakyQuery(httpx.ReadError)
+        self.assertEqual(await supabase_client._execute(query, idempotent=True), "ok")
+        self.assertEqual(query.calls, 2)
+
+    async def test_read_error_is_not_retried_for_insert(self):
+        for error in (httpx.ReadError, httpx.RemoteProtocolError):
+            query = FlakyQuery(error)
+            with self.assertRaises(error):
+                await supabase_client._execute(query)
+            self.assertEqual(query.calls, 1)
+
+
+class RecordingQuery:
+    """체인 호출을 기록해 두고 execute() 호출 횟수를 세는 쿼리"""
+
+    def __init__(self, data):
+        self.data = data
+        self.executed = 0
+        self.calls = []
+
+    def __getattr__(self, name):
+        def call(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+            return self
+        return call
+
+    async def execute(self):
+        self.executed += 1
+        return type("Response", (), {"data": self.data})()
+
+
+class RecordingClient:
+    def __init__(self, data):
+        self.query = RecordingQuery(data)
+
+    def table(self, name):
+        return self.query
+
+
+class UpdateWatchlistItemTest(unittest.IsolatedAsyncioTestCase):
+    """update_watchlist_item의 요청 생략 조건"""
+
+    def setUp(self):
+        self.row = {"stock_code": "005930", "memo": "장기 보유"}
+        self.client = RecordingClient([dict(self.row)])
+        self._original_client = supabase_client._client
+        self._original_cache = supabase_client._watchlist_cache
+        self._original_backend = supabase_client.CACHE_BACKEND
+        supabase_client._client = lambda: self.client
+        supabase_client._watchlist_cache = supabase_client._MemoryCache(60)
+
+    def tearDown(self):
+        supabase_client._client = self._original_client
+        supabase_client._watchlist_cache = self._original_cache
+        supabase_client.CACHE_BACKEND = self._original_backend
+
+    async def test_empty_updates_send_nothing(self):
+        result = await supabase_client.SupabaseService.update_watchlist_item("005930", {})
+        self.assertIsNone(result)
+        self.assertEqual(self.client.query.executed, 0)
+
+    async def test_memory_cache_snapshot_does_not_skip_update(self):
+        # 워커별 메모리 캐시는 다른 워커의 수정을 모르므로 값이 같아 보여도 UPDATE를 보냄
+        supabase_client.CACHE_BACKEND = "memory"
+        await supabase_client._watchlist_cache.set(supabase_client.WATCHLIST_ALL_KEY, [dict(self.row)])
+
+        await supabase_client.SupabaseService.update_watchlist_item("005930", {"memo": "장기 보유"})
+        self.assertEqual(self.client.query.executed, 1)
+
+    async def test_shared_cache_snapshot_skips_unchanged_update(self):
+        supabase_client.CACHE_BACKEND = "redis"
+        await supabase_client._watchlist_cache.set(supabase_client.WATCHLIST_ALL_KEY, [dict(self.row)])
+
+        result = await supabase_client.SupabaseService.update_watchlist_item("005930", {"memo": "장기 보유"})
+        self.assertEqual(result, self.row)
+        self.assertEqual(self.client.query.executed, 0)
+
+
+class AreInWatchlistTest(unittest.IsolatedAsyncioTestCase):
+    """are_in_watchlist: 캐시에 없는 종목만 IN 쿼리 한 번으로 조회"""
+
+    def setUp(self):
+        self.client = RecordingClient([{"stock_code": "005930"}])
+        self._original_client = supabase_client._client
+        self._original_cache = supabase_client._watchlist_cache
+        self._original_pool = db_pool.pool
+        supabase_client._client = lambda: self.client
+        supabase_client._watchlist_cache = supabase_client._MemoryCache(60)
+        db_pool.pool = None
+
+    def tearDown(self):
+        supabase_client._client = self._original_client
+        supabase_client._watchlist_cache = self._original_cache
+        db_pool.pool = self._original_pool
+
+    async def test_mixed_hits_and_misses(self):
+        result = await supabase_client.SupabaseService.are_in_watchlist(["005930", "000660", "005930"])
+
+        self.assertEqual(result, {"005930": True, "000660": False})
+        self.assertEqual(self.client.query.executed, 1)
+        # 중복 종목은 한 번만 조회
+        self.assertIn(("in_", ("stock_code", ["005930", "000660"]), {}), self.client.query.calls)
+        # 조회 결과는 종목별로 캐시됨 (없는 종목도 False로)
+        self.assertIs(await supabase_client._watchlist_cache.get("005930"), True)
+        self.assertIs(await supabase_client._watchlist_cache.get("000660"), False)
+
+    async def test_empty_list_sends_nothing(self):
+        self.assertEqual(await supabase_client.SupabaseService.are_in_watchlist([]), {})
+        self.assertEqual(self.client.query.executed, 0)
+
+    async def test_cached_codes_are_not_queried(self):
+        await supabase_client._watchlist_cache.set("005930", True)
+        await supabase_client._watchlist_cache.set("000660", False)
+
+        result = await supabase_client.SupabaseService.are_in_watchlist(["005930", "000660"])
+        self.assertEqual(result, {"005930": True, "000660": False})
+        self.assertEqual(self.client.query.executed, 0)
+
+        # 일부만 캐시돼 있으면 나머지만 조회
+        result = await supabase_client.SupabaseService.are_in_watchlist(["005930", "035720"])
+        self.assertEqual(result, {"005930": True, "035720": False})
+        self.assertIn(("in_", ("stock_code", ["035720"]), {}), self.client.query.calls)
+
+
+class OrjsonRequestBodyTest(unittest.IsolatedAsyncioTestCase):
+    """_use_orjson: json= 본문을 orjson 바이트로 바꿔 보냄"""
+
+    async def asyncSetUp(self):
+        self.session = httpx.AsyncClient(base_url="https://example.supabase.co/rest/v1")
+        supabase_client._use_orjson(self.session)
+
+    async def asyncTearDown(self):
+        await self.session.aclose()
+
+    async def test_json_body_is_serialized_with_orjson(self):
+        body = {"stock_code": "005930", "current_price": np.int64(71000), "total_score": np.float64(62.5)}
+        request = self.session.build_request(
+            "POST", "/sa_analysis_results", json=body, headers={"Prefer": "return=minimal"}
+        )
+
+        self.assertEqual(request.content, orjson.dumps(body, option=supabase_client._ORJSON_OPTIONS))
+        self.assertEqual(request.headers["Content-Type"], "application/json")
+        self.assertEqual(request.headers["Prefer"], "return=minimal")
+
+    async def test_request_without_json_is_unchanged(self):
+        request = self.session.build_request("GET", "/sa_watchlist", params={"select": "*"})
+
+        self.assertEqual(request.content, b"")
+        self.assertEqual(request.url.params["select"], "*")
+        self.assertNotIn("Content-Type", request.headers)
+
+
+class RecordingPool:
+    """executemany 호출을 기록하는 asyncpg 풀 대역 (failures번째 호출까지는 실패)"""
+
+    def __init__(self, failures: int = 0):
+        self.batches = []
+        self.calls = 0
+        self.failures = failures
+
+    async def executemany(self, sql, args):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise ConnectionError("connection reset")
+        self.batches.append(list(args))
+
+
+class QueuedWriteTest(unittest.IsolatedAsyncioTestCase):
+    """queue_analysis_result → _drain_writes 일괄 저장"""
+
+    def setUp(self):
+        self.pool = RecordingPool()
+        self._original_pool = db_pool.pool
+        db_pool.pool = self.pool
+        # 큐/태스크는 이벤트 루프에 묶이므로 테스트마다 새로 만듦
+        supabase_client._write_queue = None
+        supabase_client._writer_task = None
+
+    def tearDown(self):
+        db_pool.pool = self._original_pool
+
+    async def test_analyzed_at_is_enqueue_time(self):
+        before = datetime.now()
+        supabase_client.SupabaseService.queue_analysis_result({"code": "005930", "name": "삼성전자"})
+        after = datetime.now()
+        # 저장이 늦어져도 분석 시각은 큐에 넣은 시각이어야 함
+        await asyncio.sleep(supabase_client.WRITE_FLUSH_INTERVAL * 2)
+        await supabase_client.flush_writes()
+
+        [[args]] = self.pool.batches
+        analyzed_at = args[supabase_client._ANALYSIS_COLUMNS.index("analyzed_at")]
+        self.assertTrue(before <= analyzed_at <= after)
+
+    async def test_rows_are_batched_up_to_write_batch_size(self):
+        for i in range(supabase_client.WRITE_BATCH_SIZE + 5):
+            supabase_client.SupabaseService.queue_analysis_result({"code": f"{i:06d}"})
+        await supabase_client.flush_writes()
+
+        self.assertEqual([len(batch) for batch in self.pool.batches], [supabase_client.WRITE_BATCH_SIZE, 5])
+
+    async def test_flush_saves_pending_rows_and_stops_writer(self):
+        # 묶음 대기 시간이 지나기 전에 앱이 종료돼도 큐에 남은 행은 저장
+        supabase_client.SupabaseService.queue_analysis_result({"code": "005930"})
+        await supabase_client.flush_writes()
+
+        self.assertEqual(len(self.pool.batches), 1)
+        self.assertIsNone(supabase_client._writer_task)
+
+    async def test_postgrest_insert_without_pool(self):
+        db_pool.pool = None
+        client = RecordingClient([])
+        original_client = supabase_client._client
+        supabase_client._client = lambda: client
+        try:
+            supabase_client.SupabaseService.queue_analysis_result({"code": "005930"})
+            supabase_client.SupabaseService.queue_analysis_result({"code": "000660"})
+            await supabase_client.flush_writes()
+        finally:
+            supabase_client._client = original_client
+
+        self.assertEqual(client.query.executed, 1)
+        [(name, (rows,), kwargs)] = [call for call in client.query.calls if call[0] == "insert"]
+        self.assertEqual([row["stock_code"] for row in rows], ["005930", "000660"])
+        self.assertEqual(kwargs, {"returning": "minimal"})
+
+    async def test_failed_batch_is_retried_once(self):
+        self.pool.failures = 1
+        supabase_client.SupabaseService.queue_analysis_result({"code": "005930"})
+        await supabase_client.flush_writes()
+
+        self.assertEqual(self.pool.calls, 2)
+        self.assertEqual(len(self.pool.batches), 1)
+
+    async def test_batch_failing_twice_is_dropped(self):
+        self.pool.failures = supabase_client.WRITE_MAX_ATTEMPTS
+        supabase_client.SupabaseService.queue_analysis_result({"code": "005930"})
+        with self.assertLogs("supabase_client", "ERROR"):
+            await supabase_client.flush_writes()
+
+        self.assertEqual(self.pool.calls, supabase_client.WRITE_MAX_ATTEMPTS)
+        self.assertEqual(self.pool.batches, [])
+
+
+if __name__ == "__main__":
+    unittest.main()